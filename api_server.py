@@ -16,7 +16,13 @@ from typing import Dict, Any, Optional, List
 from ctypes import cast, POINTER
 from datetime import datetime
 import uuid
-from gtts import gTTS
+import hashlib
+import threading
+import functools
+import queue
+import io
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
 import speech_recognition as sr
 import asyncio
 
@@ -35,10 +41,10 @@ logging.basicConfig(
 logger = logging.getLogger("api-server")
 
 # FastAPI imports
-from fastapi import FastAPI, Request, HTTPException, Depends, BackgroundTasks, WebSocket
+from fastapi import FastAPI, Request, HTTPException, Depends, BackgroundTasks, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 # Third-party imports
@@ -52,7 +58,9 @@ except ImportError:
     rate_limiting_available = False
     
 try:
-    from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
+    from transformers import (
+        AutoModelForCausalLM, AutoTokenizer, StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer, pipeline
+    )
     huggingface_available = True
     logger.info("Hugging Face transformers imported successfully")
 except ImportError:
@@ -93,6 +101,10 @@ except ImportError:
     aura_available = False
     logger.warning("AURA core bridge not available")
     
+# TTS and STT backends, see tts_backends.TTS_BACKENDS and stt_backends.STT_BACKENDS
+from tts_backends import TTS_BACKENDS, get_tts_backend
+from stt_backends import STT_BACKENDS, VoiceSegmenter, get_recognizer, get_stt_backend
+
 # Check RAG integration
 try:
     import rag_engine
@@ -125,6 +137,228 @@ try:
 except ImportError:
     rag_available = False
 
+# Load the RAG engine at startup instead of on the first knowledge base query
+RAG_WARMUP = os.environ.get("RAG_WARMUP", "true").lower() == "true"
+
+# Configure inference concurrency
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", "16"))
+GEMINI_MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", "8"))
+HF_MAX_CONCURRENCY = int(os.environ.get("HF_MAX_CONCURRENCY", "1"))
+HF_STREAM_TIMEOUT = float(os.environ.get("HF_STREAM_TIMEOUT", "60"))  # longest wait for the next streamed token
+
+# Configure health monitoring
+HEALTH_CHECK_INTERVAL = int(os.environ.get("HEALTH_CHECK_INTERVAL", "10"))
+HEALTH_PROBE_IDLE_SECONDS = int(os.environ.get("HEALTH_PROBE_IDLE_SECONDS", "120"))
+
+# Configure Hugging Face request batching
+HF_BATCH_MAX_SIZE = int(os.environ.get("HF_BATCH_MAX_SIZE", "8"))
+HF_BATCH_MAX_WAIT_MS = float(os.environ.get("HF_BATCH_MAX_WAIT_MS", "20"))
+
+# Configure the TTS audio cache
+TTS_CACHE_MAX_BYTES = int(os.environ.get("TTS_CACHE_MAX_MB", "200")) * 1024 * 1024
+TTS_CACHE_MAX_AGE = int(os.environ.get("TTS_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+TTS_CACHE_SWEEP_INTERVAL = int(os.environ.get("TTS_CACHE_SWEEP_INTERVAL", "600"))
+
+# Configure speech synthesis
+TTS_STREAM_WORKERS = int(os.environ.get("TTS_STREAM_WORKERS", "4"))
+TTS_STREAM_MAX_CHARS = int(os.environ.get("TTS_STREAM_MAX_CHARS", "300"))
+TTS_STREAM_AHEAD = max(1, int(os.environ.get("TTS_STREAM_AHEAD", "2")))  # sentences in flight per stream
+
+# Configure speech recognition
+STT_WORKERS = int(os.environ.get("STT_WORKERS", "4"))
+STT_SAMPLE_RATE = 16000  # Raw PCM input: 16 kHz, 16-bit, mono
+STT_SAMPLE_WIDTH = 2
+STT_PARTIAL_INTERVAL_MS = int(os.environ.get("STT_PARTIAL_INTERVAL_MS", "1000"))
+VAD_SILENCE_MS = int(os.environ.get("VAD_SILENCE_MS", "600"))
+VAD_THRESHOLD_RATIO = float(os.environ.get("VAD_THRESHOLD_RATIO", "3.0"))
+VOICE_EXIT_WORDS = ["exit", "quit", "stop"]
+
+class InferenceBackend:
+    """Limits concurrent blocking calls to one model backend and tracks queue and health metrics"""
+    
+    # Upper bounds in seconds of the latency histogram buckets
+    LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf")]
+    
+    def __init__(self, name: str, max_concurrency: int, health_window: int = 50):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.recent_outcomes = deque(maxlen=health_window)
+        self.latency_histogram = [0] * len(self.LATENCY_BUCKETS)
+        self.last_activity = 0.0
+        self.last_error = None
+    
+    def _record(self, success: bool, latency: float, error: Optional[str] = None):
+        """Record the outcome of a finished call; the caller must hold the lock"""
+        if success:
+            self.completed += 1
+        else:
+            self.failed += 1
+            self.last_error = error
+        self.total_latency += latency
+        self.recent_outcomes.append(success)
+        for i, bound in enumerate(self.LATENCY_BUCKETS):
+            if latency <= bound:
+                self.latency_histogram[i] += 1
+                break
+        self.last_activity = time.time()
+    
+    def call(self, func, *args, **kwargs):
+        """Run a blocking call once a slot for this backend is free"""
+        with self._lock:
+            self.waiting += 1
+        self._slots.acquire()
+        with self._lock:
+            self.waiting -= 1
+            self.active += 1
+        
+        start_time = time.time()
+        try:
+            result = func(*args, **kwargs)
+            with self._lock:
+                self._record(True, time.time() - start_time)
+            return result
+        except Exception as e:
+            with self._lock:
+                self._record(False, time.time() - start_time, str(e))
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+            self._slots.release()
+    
+    def idle_for(self) -> float:
+        """Seconds since the last call finished"""
+        return time.time() - self.last_activity
+    
+    def health(self) -> Dict[str, Any]:
+        """Derive liveness from recent call outcomes"""
+        with self._lock:
+            outcomes = list(self.recent_outcomes)
+            return {
+                "online": bool(outcomes) and outcomes[-1],
+                "error_rate": outcomes.count(False) / len(outcomes) if outcomes else None,
+                "last_error": self.last_error,
+                "last_activity": self.last_activity,
+                "latency_histogram": {
+                    (f"le_{bound}" if bound != float("inf") else "le_inf"): count
+                    for bound, count in zip(self.LATENCY_BUCKETS, self.latency_histogram)
+                }
+            }
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get a snapshot of the backend's queue metrics"""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "max_concurrency": self.max_concurrency,
+                "queue_depth": self.waiting,
+                "active": self.active,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_latency": self.total_latency / finished if finished else None
+            }
+
+class GenerationBatcher:
+    """Collects concurrent prompts and runs them through a single batched generate call"""
+    
+    def __init__(self, generate_batch, max_batch_size: int, max_wait: float):
+        self.generate_batch = generate_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.largest_batch = 0
+        self._worker = threading.Thread(target=self._run, name="hf-batcher", daemon=True)
+        self._worker.start()
+    
+    def submit(self, prompt: str) -> str:
+        """Queue a prompt and block until its batch has been generated"""
+        future = Future()
+        self._queue.put((prompt, future))
+        return future.result()
+    
+    def _collect(self) -> List:
+        """Wait for a first prompt, then gather more until the batch is full or the wait expires"""
+        batch = [self._queue.get()]
+        deadline = time.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        while True:
+            batch = self._collect()
+            prompts = [prompt for prompt, _ in batch]
+            try:
+                results = self.generate_batch(prompts)
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            
+            with self._lock:
+                self.batches += 1
+                self.requests += len(batch)
+                self.largest_batch = max(self.largest_batch, len(batch))
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get a snapshot of the batching metrics"""
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "queue_depth": self._queue.qsize(),
+                "batches": self.batches,
+                "requests": self.requests,
+                "avg_batch_size": self.requests / self.batches if self.batches else None,
+                "largest_batch": self.largest_batch
+            }
+
+inference_backends = {
+    "gemini": InferenceBackend("gemini", GEMINI_MAX_CONCURRENCY),
+    "huggingface": InferenceBackend("huggingface", HF_MAX_CONCURRENCY)
+}
+
+# Blocking model and command work runs here so the event loop stays responsive
+inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+inference_pending = 0
+
+async def run_in_inference_pool(func, *args, **kwargs):
+    """Run a blocking function on the inference pool without blocking the event loop"""
+    global inference_pending
+    loop = asyncio.get_event_loop()
+    inference_pending += 1
+    try:
+        return await loop.run_in_executor(inference_executor, functools.partial(func, *args, **kwargs))
+    finally:
+        inference_pending -= 1
+
+def get_inference_metrics() -> Dict[str, Any]:
+    """Get queue depth and throughput metrics for the inference layer"""
+    return {
+        "workers": INFERENCE_WORKERS,
+        "pending": inference_pending,
+        "chat_sessions": len(gemini_chat_sessions),
+        "backends": {name: backend.metrics() for name, backend in inference_backends.items()},
+        "hf_batching": hf_batcher.metrics() if hf_batcher is not None else None
+    }
+
 # Global state
 last_command_result = None
 model_status = {
@@ -136,87 +370,98 @@ model_status = {
     "load": None
 }
 
-# Helper functions
-def check_model_status() -> Dict[str, Any]:
-    """Check if the AI model (Gemini API or Hugging Face) is available"""
-    global model_status
+def get_active_backend() -> str:
+    """Name of the inference backend serving requests"""
+    if huggingface_available and USE_HUGGINGFACE and hf_generator is not None:
+        return "huggingface"
+    return "gemini"
+
+def probe_model():
+    """Cheap liveness probe, only used when no real requests have been served recently"""
+    if get_active_backend() == "huggingface":
+        inputs = hf_tokenizer("Hello", return_tensors="pt")
+        hf_model.generate(**inputs, max_new_tokens=1, pad_token_id=hf_tokenizer.pad_token_id)
+    else:
+        # Model metadata lookup, no generation needed
+        genai.get_model(f"models/{GEMINI_MODEL}")
+
+def refresh_model_status():
+    """Rebuild the cached status snapshot from the active backend's recent outcomes"""
+    backend_name = get_active_backend()
+    backend = inference_backends[backend_name]
+    health = backend.health()
     
-    # Don't check more often than every 10 seconds
-    current_time = time.time()
-    if current_time - model_status["last_checked"] < 10:
-        return model_status
+    if backend_name == "huggingface":
+        provider, model_name, memory_usage = "Hugging Face", HF_MODEL_NAME, "Local model"
+    else:
+        provider, model_name, memory_usage = "Google Gemini", GEMINI_MODEL, "N/A (Cloud API)"
     
-    # Check Hugging Face model if enabled
-    if huggingface_available and USE_HUGGINGFACE:
-        try:
-            if hf_model is None or hf_tokenizer is None:
-                raise ValueError("Hugging Face model not properly initialized")
-                
-            # Simple test query to check if the model is responsive
-            test_input = "Hello"
-            test_prompt = f"User: {test_input}\n\nAssistant:"
-            
-            _ = hf_generator(
-                test_prompt,
-                max_length=50,
-                num_return_sequences=1,
-                pad_token_id=hf_tokenizer.eos_token_id,
-                temperature=0.7
-            )
-            
-            model_status.update({
-                "last_checked": current_time,
-                "online": True,
-                "status": "Hugging Face model is online",
-                "model": HF_MODEL_NAME,
-                "provider": "Hugging Face",
-                "memory_usage": "Local model",
-                "load": 0.0  # We don't track load for local models
-            })
-            return model_status
-        except Exception as e:
-            logger.error(f"Error checking Hugging Face model status: {str(e)}")
-            model_status.update({
-                "last_checked": current_time,
-                "online": False,
-                "status": f"Error connecting to Hugging Face model: {str(e)}",
-                "provider": "Hugging Face",
-                "model": HF_MODEL_NAME
-            })
-            return model_status
+    if health["online"]:
+        status_text = f"{provider} model is online"
+    elif health["last_error"]:
+        status_text = f"Error connecting to {provider} model: {health['last_error']}"
+    else:
+        status_text = f"{provider} model has not been checked yet"
     
-    # Check Gemini API if Hugging Face is not enabled
-    try:
-        # Simple test query to check if the API is responsive
-        model = genai.GenerativeModel(GEMINI_MODEL)
-        response = model.generate_content("Hello")
-        
-        model_status.update({
-            "last_checked": current_time,
-            "online": True,
-            "status": "Gemini API is online",
-            "model": GEMINI_MODEL,
-            "provider": "Google Gemini",
-            "memory_usage": "N/A (Cloud API)",
-            "load": 0.0  # Cloud API doesn't expose load metrics
-        })
-        return model_status
-        
-    except Exception as e:
-        logger.error(f"Error checking Gemini API status: {str(e)}")
-        model_status.update({
-            "last_checked": current_time,
-            "online": False,
-            "status": f"Error connecting to Gemini API: {str(e)}",
-            "provider": "Google Gemini",
-            "model": GEMINI_MODEL
-        })
-        return model_status
+    model_status.update({
+        "last_checked": time.time(),
+        "online": health["online"],
+        "status": status_text,
+        "model": model_name,
+        "provider": provider,
+        "memory_usage": memory_usage,
+        "load": backend.metrics()["active"] / backend.max_concurrency,
+        "error_rate": health["error_rate"],
+        "last_activity": health["last_activity"],
+        "latency_histogram": health["latency_histogram"]
+    })
+
+class HealthMonitor:
+    """Background thread that keeps the model status snapshot fresh, probing only when idle"""
+    
+    def __init__(self, interval: int, probe_idle_seconds: int):
+        self.interval = interval
+        self.probe_idle_seconds = probe_idle_seconds
+        self.probes = 0
+        self._started = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+    
+    def start(self):
+        """Start monitoring if not already running"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        refresh_model_status()
+        threading.Thread(target=self._run, name="health-monitor", daemon=True).start()
+    
+    def stop(self):
+        self._stop.set()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            backend = inference_backends[get_active_backend()]
+            if backend.idle_for() >= self.probe_idle_seconds:
+                try:
+                    self.probes += 1
+                    backend.call(probe_model)
+                except Exception as e:
+                    logger.error(f"Health probe failed: {str(e)}")
+            refresh_model_status()
+
+health_monitor = HealthMonitor(HEALTH_CHECK_INTERVAL, HEALTH_PROBE_IDLE_SECONDS)
+
+# Helper functions
+def check_model_status() -> Dict[str, Any]:
+    """Get the cached status of the AI model (Gemini API or Hugging Face)"""
+    health_monitor.start()
+    return dict(model_status)
 
 def query_huggingface(prompt: str, system_prompt: Optional[str] = None) -> str:
     """Query the Hugging Face model"""
     try:
-        if hf_generator is None:
+        if hf_batcher is None:
             raise ValueError("Hugging Face model not loaded")
         
         # Format the prompt with system prompt if provided
@@ -225,27 +470,131 @@ def query_huggingface(prompt: str, system_prompt: Optional[str] = None) -> str:
         else:
             full_prompt = f"User: {prompt}\n\nAssistant:"
         
-        # Generate response from the model
-        response = hf_generator(
-            full_prompt,
-            max_length=1024,
-            num_return_sequences=1,
-            pad_token_id=hf_tokenizer.eos_token_id,
-            temperature=0.7,
-            top_p=0.95,
-            do_sample=True
-        )
-        
-        # Extract the generated text and remove the prompt
-        generated_text = response[0]['generated_text']
-        answer = generated_text.split("Assistant:", 1)[-1].strip()
-        
-        return answer
+        # Generate response from the model, batched with concurrent requests
+        return hf_batcher.submit(full_prompt)
     except Exception as e:
         logger.error(f"Error querying Hugging Face model: {str(e)}")
         return f"Error: {str(e)}"
 
-def query_gemini(prompt: str, system_prompt: Optional[str] = None) -> str:
+# Gemini generation settings shared by all requests
+GEMINI_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 0.95,
+    "top_k": 64,
+    "max_output_tokens": 1024,
+}
+
+GEMINI_SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+]
+
+# Configure Gemini chat session pooling
+GEMINI_MAX_CHAT_SESSIONS = int(os.environ.get("GEMINI_MAX_CHAT_SESSIONS", "256"))
+GEMINI_CHAT_SESSION_TTL = int(os.environ.get("GEMINI_CHAT_SESSION_TTL", "1800"))
+GEMINI_CHAT_MAX_TURNS = int(os.environ.get("GEMINI_CHAT_MAX_TURNS", "20"))
+
+gemini_models = {}
+gemini_models_lock = threading.Lock()
+
+def get_gemini_model(system_prompt: Optional[str] = None, model_name: str = GEMINI_MODEL,
+                     generation_config: Optional[Dict[str, Any]] = None):
+    """Get a cached Gemini model for the given model name, system prompt and generation config"""
+    generation_config = generation_config or GEMINI_GENERATION_CONFIG
+    key = (model_name, system_prompt, json.dumps(generation_config, sort_keys=True))
+    
+    with gemini_models_lock:
+        model = gemini_models.get(key)
+        if model is None:
+            model = genai.GenerativeModel(
+                model_name=model_name,
+                generation_config=generation_config,
+                safety_settings=GEMINI_SAFETY_SETTINGS,
+                system_instruction=system_prompt
+            )
+            gemini_models[key] = model
+        return model
+
+class ChatSessionPool:
+    """Keeps one Gemini chat session per conversation, evicting the least recently used"""
+    
+    def __init__(self, max_sessions: int, ttl: int, max_turns: int):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_turns = max_turns
+        self._sessions = {}  # conversation_id -> [chat, system_prompt, last_used, lock]
+        self._lock = threading.Lock()
+    
+    def _evict(self, current_time: float):
+        """Drop expired sessions and the oldest ones above the size limit"""
+        expired = [cid for cid, entry in self._sessions.items() if current_time - entry[2] > self.ttl]
+        for cid in expired:
+            del self._sessions[cid]
+        
+        while len(self._sessions) >= self.max_sessions:
+            oldest = min(self._sessions, key=lambda cid: self._sessions[cid][2])
+            del self._sessions[oldest]
+    
+    def _get_session(self, conversation_id: str, system_prompt: Optional[str]):
+        """Get the conversation's chat session and lock, creating the session if needed"""
+        current_time = time.time()
+        with self._lock:
+            entry = self._sessions.get(conversation_id)
+            if entry is None or entry[1] != system_prompt:
+                self._evict(current_time)
+                chat = get_gemini_model(system_prompt).start_chat(history=[])
+                entry = [chat, system_prompt, current_time, threading.Lock()]
+                self._sessions[conversation_id] = entry
+            entry[2] = current_time
+            return entry[0], entry[3]
+    
+    def _trim_history(self, chat):
+        """Keep the history sent with each message bounded"""
+        if len(chat.history) > self.max_turns * 2:
+            chat.history = chat.history[-self.max_turns * 2:]
+    
+    def send(self, conversation_id: str, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Send a message in the conversation's chat session, creating it if needed"""
+        chat, session_lock = self._get_session(conversation_id, system_prompt)
+        # Messages in one conversation must be sent in order
+        with session_lock:
+            try:
+                response = chat.send_message(prompt)
+            except Exception:
+                # A failed send leaves the chat unusable for later messages
+                self.drop(conversation_id, chat)
+                raise
+            self._trim_history(chat)
+            return response.text
+    
+    def stream(self, conversation_id: str, prompt: str, system_prompt: Optional[str] = None):
+        """Send a message in the conversation's chat session and yield the response as it arrives"""
+        chat, session_lock = self._get_session(conversation_id, system_prompt)
+        with session_lock:
+            try:
+                for chunk in chat.send_message(prompt, stream=True):
+                    yield chunk.text
+            except BaseException:
+                # A failed or abandoned stream leaves the chat unusable for later messages
+                self.drop(conversation_id, chat)
+                raise
+            self._trim_history(chat)
+    
+    def drop(self, conversation_id: str, chat=None):
+        """Forget a conversation's chat session, only if it is still the given chat"""
+        with self._lock:
+            entry = self._sessions.get(conversation_id)
+            if entry is not None and (chat is None or entry[0] is chat):
+                del self._sessions[conversation_id]
+    
+    def __len__(self):
+        return len(self._sessions)
+
+gemini_chat_sessions = ChatSessionPool(GEMINI_MAX_CHAT_SESSIONS, GEMINI_CHAT_SESSION_TTL, GEMINI_CHAT_MAX_TURNS)
+
+def query_gemini(prompt: str, system_prompt: Optional[str] = None, conversation_id: Optional[str] = None) -> str:
     """Query the Gemini API or Hugging Face model based on configuration"""
     # If Hugging Face model is available and enabled, use it instead of Gemini
     if huggingface_available and USE_HUGGINGFACE and hf_generator is not None:
@@ -253,42 +602,152 @@ def query_gemini(prompt: str, system_prompt: Optional[str] = None) -> str:
         
     # Otherwise, use Gemini
     try:
-        # Configure the model
-        generation_config = {
-            "temperature": 0.7,
-            "top_p": 0.95,
-            "top_k": 64,
-            "max_output_tokens": 1024,
-        }
-        
-        safety_settings = [
-            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-        ]
-        
-        model = genai.GenerativeModel(
-            model_name=GEMINI_MODEL,
-            generation_config=generation_config,
-            safety_settings=safety_settings
-        )
-        
-        # Create a chat session
-        chat = model.start_chat(history=[])
-        
-        # Add system prompt if provided
-        if system_prompt:
-            chat.send_message(system_prompt)
+        if conversation_id:
+            # Continue the conversation's pooled chat session
+            return inference_backends["gemini"].call(
+                gemini_chat_sessions.send, conversation_id, prompt, system_prompt
+            )
         
-        # Send the user prompt and get response
-        response = chat.send_message(prompt)
+        # Single-turn request, the system prompt is sent as a system instruction
+        model = get_gemini_model(system_prompt)
+        response = inference_backends["gemini"].call(model.generate_content, prompt)
         return response.text
         
     except Exception as e:
         logger.error(f"Error querying Gemini API: {str(e)}")
         return f"Error: {str(e)}"
 
+async def query_gemini_async(prompt: str, system_prompt: Optional[str] = None,
+                             conversation_id: Optional[str] = None) -> str:
+    """Query the configured model from async code without blocking the event loop"""
+    return await run_in_inference_pool(query_gemini, prompt, system_prompt, conversation_id)
+
+def generate_huggingface_batch(prompts: List[str]) -> List[str]:
+    """Generate answers for several prompts with one padded generate call"""
+    inputs = hf_tokenizer(prompts, return_tensors="pt", padding=True)
+    outputs = inference_backends["huggingface"].call(
+        hf_model.generate,
+        **inputs,
+        max_length=1024,
+        pad_token_id=hf_tokenizer.pad_token_id,
+        temperature=0.7,
+        top_p=0.95,
+        do_sample=True
+    )
+    
+    # Prompts are left-padded to the same length, so new tokens start at the same offset
+    prompt_length = inputs["input_ids"].shape[1]
+    return [
+        hf_tokenizer.decode(output[prompt_length:], skip_special_tokens=True).strip()
+        for output in outputs
+    ]
+
+def stream_huggingface(prompt: str, system_prompt: Optional[str] = None):
+    """Yield text from the Hugging Face model as tokens are generated"""
+    if hf_model is None or hf_tokenizer is None:
+        raise ValueError("Hugging Face model not loaded")
+    
+    # Format the prompt with system prompt if provided
+    if system_prompt:
+        full_prompt = f"{system_prompt}\n\nUser: {prompt}\n\nAssistant:"
+    else:
+        full_prompt = f"User: {prompt}\n\nAssistant:"
+    
+    inputs = hf_tokenizer(full_prompt, return_tensors="pt")
+    streamer = TextIteratorStreamer(hf_tokenizer, skip_prompt=True, skip_special_tokens=True,
+                                    timeout=HF_STREAM_TIMEOUT)
+    stop = threading.Event()
+    errors = []
+    
+    class StopWhenClosed(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            return stop.is_set()
+    
+    def generate(**kwargs):
+        # A failed generate never ends the streamer, so end it here and re-raise in the consumer
+        try:
+            hf_model.generate(**kwargs)
+        except Exception as e:
+            errors.append(e)
+            streamer.end()
+    
+    generation = threading.Thread(
+        target=generate,
+        kwargs=dict(
+            **inputs,
+            streamer=streamer,
+            stopping_criteria=StoppingCriteriaList([StopWhenClosed()]),
+            max_length=1024,
+            pad_token_id=hf_tokenizer.eos_token_id,
+            temperature=0.7,
+            top_p=0.95,
+            do_sample=True
+        ),
+        daemon=True
+    )
+    generation.start()
+    
+    try:
+        for text in streamer:
+            if text:
+                yield text
+        if errors:
+            raise errors[0]
+    finally:
+        # If the consumer stops early, end generation at the next token and wait
+        # for it, so the caller's backend slot covers the whole generation
+        stop.set()
+        generation.join(HF_STREAM_TIMEOUT)
+        if generation.is_alive():
+            logger.warning("Hugging Face generation did not stop within the stream timeout")
+
+def stream_gemini(prompt: str, system_prompt: Optional[str] = None, conversation_id: Optional[str] = None):
+    """Yield text from the Gemini API as it is generated"""
+    if conversation_id:
+        yield from gemini_chat_sessions.stream(conversation_id, prompt, system_prompt)
+        return
+    
+    model = get_gemini_model(system_prompt)
+    for chunk in model.generate_content(prompt, stream=True):
+        yield chunk.text
+
+async def stream_query(prompt: str, system_prompt: Optional[str] = None, conversation_id: Optional[str] = None):
+    """Stream the configured model's response without blocking the event loop"""
+    if huggingface_available and USE_HUGGINGFACE and hf_model is not None:
+        backend, generate = inference_backends["huggingface"], functools.partial(stream_huggingface, prompt, system_prompt)
+    else:
+        backend, generate = inference_backends["gemini"], functools.partial(stream_gemini, prompt, system_prompt, conversation_id)
+    
+    loop = asyncio.get_event_loop()
+    chunks = asyncio.Queue()
+    done = object()
+    cancelled = threading.Event()
+    
+    def produce():
+        # Runs on the inference pool, holding one backend slot for the whole generation
+        stream = generate()
+        try:
+            for text in stream:
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(chunks.put_nowait, text)
+        finally:
+            # Closing stops the generation before the slot is released
+            stream.close()
+            loop.call_soon_threadsafe(chunks.put_nowait, done)
+    
+    producer = asyncio.ensure_future(run_in_inference_pool(backend.call, produce))
+    try:
+        while True:
+            text = await chunks.get()
+            if text is done:
+                break
+            yield text
+        # Surface generation errors to the caller
+        await producer
+    finally:
+        cancelled.set()
+
 def open_website(url: str) -> str:
     """Open a website in the default browser"""
     try:
@@ -494,6 +953,210 @@ STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
 AUDIO_DIR = os.path.join(STATIC_DIR, "audio")
 os.makedirs(AUDIO_DIR, exist_ok=True)
 
+class TTSCache:
+    """
+    Content-addressed cache of synthesized audio files in AUDIO_DIR.
+
+    Files are named by a hash of the text, language and voice, so repeated
+    phrases are served without synthesis. A background sweeper deletes files
+    not used for max_age seconds, then the least recently used files until
+    the directory fits in max_bytes.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int, max_age: int, sweep_interval: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.sweep_interval = sweep_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Directory usage, set by each sweep and kept current by new files in between
+        self.files = 0
+        self.bytes = 0
+        self._started = False
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, List] = {}  # filename -> [lock, threads using it]
+        self._stop = threading.Event()
+    
+    @staticmethod
+    def filename(text: str, language: str, voice: Optional[str], backend: str = "gtts",
+                 extension: str = "mp3") -> str:
+        """Cache file name of an utterance"""
+        key = json.dumps([backend, text, language or "", voice or ""], ensure_ascii=False)
+        return f"tts_{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.{extension}"
+    
+    def get_or_create(self, filename: str, synthesize) -> str:
+        """
+        Path of a cached file, calling synthesize(path) to write it on a miss.
+        
+        Concurrent misses for the same file synthesize it once.
+        """
+        path = os.path.join(self.directory, filename)
+        with self._lock:
+            entry = self._key_locks.get(filename)
+            if entry is None:
+                entry = self._key_locks[filename] = [threading.Lock(), 0]
+            entry[1] += 1
+        
+        try:
+            with entry[0]:
+                if os.path.exists(path):
+                    # The modification time doubles as the last use time for eviction
+                    os.utime(path)
+                    with self._lock:
+                        self.hits += 1
+                    return path
+                
+                # Write under a temporary name so a partial file is never served
+                temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                try:
+                    synthesize(temp_path)
+                    size = os.path.getsize(temp_path)
+                    os.replace(temp_path, path)
+                finally:
+                    if os.path.exists(temp_path):
+                        os.unlink(temp_path)
+                with self._lock:
+                    self.misses += 1
+                    self.files += 1
+                    self.bytes += size
+                return path
+        finally:
+            with self._lock:
+                # Threads still waiting on the lock must find the same one
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._key_locks[filename]
+    
+    def lookup(self, filename: str) -> Optional[str]:
+        """Path of a cached file, counted as a hit, or None if it is not cached"""
+        path = os.path.join(self.directory, filename)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+    
+    def _files(self):
+        """(path, size, last use) of every cached audio file"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.startswith("tts_") and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+    
+    def sweep(self) -> int:
+        """Delete expired files, then the least recently used ones over the size limit"""
+        now = time.time()
+        files = sorted(self._files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for path, size, last_used in files:
+            if now - last_used <= self.max_age and total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        with self._lock:
+            self.evictions += removed
+            self.files = len(files) - removed
+            self.bytes = total
+        return removed
+    
+    def start(self):
+        """Start the sweeper if not already running"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._run, name="tts-cache-sweeper", daemon=True).start()
+    
+    def stop(self):
+        self._stop.set()
+    
+    def _run(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"TTS cache sweep failed: {str(e)}")
+            if self._stop.wait(self.sweep_interval):
+                return
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counts and directory usage, without touching the disk"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "files": self.files,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes
+            }
+
+tts_cache = TTSCache(AUDIO_DIR, TTS_CACHE_MAX_BYTES, TTS_CACHE_MAX_AGE, TTS_CACHE_SWEEP_INTERVAL)
+
+# Speech synthesis pool, shared by /api/tts and streamed speech
+tts_executor = ThreadPoolExecutor(max_workers=TTS_STREAM_WORKERS, thread_name_prefix="tts")
+
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?;])\s+")
+
+def split_sentences(text: str, max_chars: int = TTS_STREAM_MAX_CHARS) -> List[str]:
+    """Split text into sentences, breaking sentences longer than max_chars at word boundaries"""
+    chunks = []
+    for sentence in SENTENCE_END_PATTERN.split(text.strip()):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            chunks.append(sentence)
+    return chunks
+
+async def stream_speech(text: str, language: str = "en", voice: Optional[str] = None, backend=None):
+    """
+    Yield the audio of each sentence of text in order, as complete audio files.
+    
+    Up to TTS_STREAM_AHEAD sentences are synthesized ahead of playback on the
+    TTS pool, so the first chunk is ready after one sentence and later ones are
+    usually done by the time they are needed, while one long text cannot fill
+    the pool shared with other streams and /api/tts. Pending syntheses are
+    cancelled if the consumer stops.
+    """
+    backend = backend or get_tts_backend()
+    loop = asyncio.get_event_loop()
+    sentences = iter(split_sentences(text))
+    pending = deque()
+    
+    def submit_next():
+        sentence = next(sentences, None)
+        if sentence is not None:
+            pending.append(loop.run_in_executor(tts_executor, backend.synthesize, sentence, language, voice))
+    
+    try:
+        for _ in range(TTS_STREAM_AHEAD):
+            submit_next()
+        while pending:
+            audio = await pending.popleft()
+            submit_next()
+            yield audio
+    finally:
+        for future in pending:
+            future.cancel()
+
 # Initialize FastAPI app
 app = FastAPI(title="AURA API Server")
 
@@ -543,6 +1206,7 @@ app.add_middleware(
 hf_model = None
 hf_tokenizer = None
 hf_generator = None
+hf_batcher = None
 
 if huggingface_available and USE_HUGGINGFACE:
     try:
@@ -550,6 +1214,12 @@ if huggingface_available and USE_HUGGINGFACE:
         hf_tokenizer = AutoTokenizer.from_pretrained(HF_MODEL_NAME)
         hf_model = AutoModelForCausalLM.from_pretrained(HF_MODEL_NAME)
         hf_generator = pipeline("text-generation", model=hf_model, tokenizer=hf_tokenizer)
+        
+        # Decoder-only models need left padding for batched generation
+        hf_tokenizer.padding_side = "left"
+        if hf_tokenizer.pad_token is None:
+            hf_tokenizer.pad_token = hf_tokenizer.eos_token
+        hf_batcher = GenerationBatcher(generate_huggingface_batch, HF_BATCH_MAX_SIZE, HF_BATCH_MAX_WAIT_MS / 1000)
         logger.info("Hugging Face model loaded successfully")
     except Exception as e:
         logger.error(f"Error loading Hugging Face model: {str(e)}")
@@ -565,6 +1235,7 @@ else:
 # Models
 class MessageRequest(BaseModel):
     message: str
+    conversation_id: Optional[str] = None
 
 class CommandRequest(BaseModel):
     command: str
@@ -574,10 +1245,12 @@ class TTSRequest(BaseModel):
     text: str
     voice_id: Optional[str] = None
     language: Optional[str] = "en"
+    backend: Optional[str] = None  # "gtts" or "local", TTS_BACKEND by default
 
 class STTRequest(BaseModel):
     audio_data: str  # Base64 encoded audio data
     language: Optional[str] = "en-US"
+    backend: Optional[str] = None  # "google", "sphinx" or "stub", STT_BACKEND by default
 
 # AURA-specific models
 class AuraStatusResponse(BaseModel):
@@ -588,6 +1261,27 @@ class AuraStatusResponse(BaseModel):
 class AuraActionRequest(BaseModel):
     action: str  # 'initialize', 'start', 'stop'
 
+# Lifecycle hooks
+@app.on_event("startup")
+async def startup_event():
+    """Warm up long-lived engines before serving requests"""
+    health_monitor.start()
+    tts_cache.start()
+    if rag_available and RAG_WARMUP:
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, rag_engine.get_rag_engine().warm_up)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release long-lived engines"""
+    if rag_available:
+        rag_engine.close_rag_engine()
+    health_monitor.stop()
+    tts_cache.stop()
+    tts_executor.shutdown(wait=False)
+    stt_executor.shutdown(wait=False)
+    inference_executor.shutdown(wait=False)
+
 # Endpoints
 @app.get("/")
 async def root():
@@ -597,18 +1291,32 @@ async def root():
 @app.get("/status")
 async def status():
     """Get model status"""
-    return check_model_status()
+    return {
+        **check_model_status(),
+        "inference": get_inference_metrics(),
+        "tts_cache": tts_cache.stats(),
+        "tts_backends": {name: backend.available() for name, backend in TTS_BACKENDS.items()},
+        "stt_backends": {name: backend.available() for name, backend in STT_BACKENDS.items()}
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Get inference queue and RAG metrics"""
+    return {
+        **get_inference_metrics(),
+        "rag": rag_engine.get_rag_engine().metrics() if rag_available else None
+    }
+
+# System prompt for chat queries
+QUERY_SYSTEM_PROMPT = "You are AURA, an advanced AI assistant. Provide helpful, accurate, and concise responses."
 
 @app.post("/query")
 @limiter.limit("20/minute")
 async def query(request: MessageRequest, request_obj: Request):
     """Query the model with a message"""
     try:
-        # Prepare system prompt
-        system_prompt = "You are AURA, an advanced AI assistant. Provide helpful, accurate, and concise responses."
-        
         # Get response from the model
-        response = query_gemini(request.message, system_prompt)
+        response = await query_gemini_async(request.message, QUERY_SYSTEM_PROMPT, request.conversation_id)
         
         return {
             "success": True,
@@ -619,6 +1327,77 @@ async def query(request: MessageRequest, request_obj: Request):
         logger.error(f"Error in query endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/query/stream")
+@limiter.limit("20/minute")
+async def query_stream(request: MessageRequest, request_obj: Request):
+    """Query the model with a message and stream the response as Server-Sent Events"""
+    async def events():
+        chunks = []
+        try:
+            async for text in stream_query(request.message, QUERY_SYSTEM_PROMPT, request.conversation_id):
+                chunks.append(text)
+                yield f"data: {json.dumps({'type': 'token', 'text': text})}\n\n"
+            yield f"data: {json.dumps({'type': 'done', 'response': ''.join(chunks), 'model': GEMINI_MODEL})}\n\n"
+        except Exception as e:
+            logger.error(f"Error in query stream: {str(e)}")
+            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def receive_json_object(websocket: WebSocket) -> Optional[Dict[str, Any]]:
+    """The next message as a JSON object, or None after answering a malformed one with an error"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    try:
+        request = json.loads(message.get("text") or "")
+    except ValueError:
+        request = None
+    if not isinstance(request, dict):
+        await websocket.send_json({"type": "error", "message": "Messages must be JSON objects"})
+        return None
+    return request
+
+@app.websocket("/ws/query")
+async def query_websocket(websocket: WebSocket):
+    """WebSocket endpoint that streams model responses token by token"""
+    await websocket.accept()
+    
+    try:
+        while True:
+            # Each message is a JSON object with "message" and optional "conversation_id"
+            request = await receive_json_object(websocket)
+            if request is None:
+                continue
+            message = request.get("message", "")
+            if not message:
+                await websocket.send_json({"type": "error", "message": "Empty message"})
+                continue
+            
+            chunks = []
+            try:
+                async for text in stream_query(message, QUERY_SYSTEM_PROMPT, request.get("conversation_id")):
+                    chunks.append(text)
+                    await websocket.send_json({"type": "token", "text": text})
+                await websocket.send_json({"type": "done", "response": "".join(chunks), "model": GEMINI_MODEL})
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.error(f"Error in query websocket: {str(e)}")
+                await websocket.send_json({"type": "error", "message": str(e)})
+    except WebSocketDisconnect:
+        pass
+
+@app.delete("/query/{conversation_id}")
+async def end_conversation(conversation_id: str):
+    """Forget the chat session of a conversation"""
+    gemini_chat_sessions.drop(conversation_id)
+    return {"success": True, "conversation_id": conversation_id}
+
 @app.post("/execute")
 @limiter.limit("10/minute")
 async def execute(request: CommandRequest, background_tasks: BackgroundTasks, request_obj: Request):
@@ -631,7 +1410,7 @@ async def execute(request: CommandRequest, background_tasks: BackgroundTasks, re
             raise HTTPException(status_code=400, detail="AURA integration is not available")
             
         # Execute the command
-        result = execute_command(command)
+        result = await run_in_inference_pool(execute_command, command)
         last_command_result = result
         
         return result
@@ -643,13 +1422,24 @@ async def execute(request: CommandRequest, background_tasks: BackgroundTasks, re
 async def text_to_speech(request: TTSRequest):
     """Convert text to speech and return audio URL"""
     try:
-        # Create unique filename for this audio
-        filename = f"tts_{uuid.uuid4()}.mp3"
-        filepath = os.path.join(AUDIO_DIR, filename)
+        backend = get_tts_backend(request.backend)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        # Identical text, language, voice and backend reuse the same file
+        filename = TTSCache.filename(request.text, request.language, request.voice_id,
+                                     backend.name, backend.extension)
         
-        # Generate speech using gTTS
-        tts = gTTS(text=request.text, lang=request.language)
-        tts.save(filepath)
+        def synthesize(filepath):
+            audio = backend.synthesize(request.text, request.language, request.voice_id)
+            with open(filepath, "wb") as f:
+                f.write(audio)
+        
+        # Cached audio is served without waiting for a synthesis worker
+        if tts_cache.lookup(filename) is None:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(tts_executor, tts_cache.get_or_create, filename, synthesize)
         
         # Return URL to access the audio file
         audio_url = f"/static/audio/{filename}"
@@ -663,35 +1453,193 @@ async def text_to_speech(request: TTSRequest):
         logger.error(f"TTS error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/tts/stream")
+async def text_to_speech_stream(request: TTSRequest):
+    """Stream speech, sentence by sentence, in the response body"""
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text is empty")
+    try:
+        backend = get_tts_backend(request.backend)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def body():
+        # Join the sentences' audio files into one playable stream
+        first = True
+        async for audio in stream_speech(request.text, request.language, request.voice_id, backend):
+            yield backend.stream_chunk(audio, first)
+            first = False
+    
+    return StreamingResponse(body(), media_type=backend.media_type)
+
+@app.websocket("/ws/tts")
+async def tts_websocket(websocket: WebSocket):
+    """
+    WebSocket endpoint for streamed speech.
+    
+    Each JSON message ({"text": ..., "language": ..., "voice_id": ..., "backend": ...})
+    is answered with a "start" message, one binary frame per sentence holding
+    a complete audio file, and a "done" message.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            request = await receive_json_object(websocket)
+            if request is None:
+                continue
+            text = request.get("text") or ""
+            text = text.strip() if isinstance(text, str) else ""
+            if not text:
+                await websocket.send_json({"type": "error", "message": "Text is empty"})
+                continue
+            
+            try:
+                backend = get_tts_backend(request.get("backend"))
+                chunks = 0
+                await websocket.send_json({"type": "start", "text": text, "media_type": backend.media_type})
+                async for audio in stream_speech(text, request.get("language") or "en",
+                                                 request.get("voice_id"), backend):
+                    await websocket.send_bytes(audio)
+                    chunks += 1
+                await websocket.send_json({"type": "done", "chunks": chunks})
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.error(f"Error in TTS websocket: {str(e)}")
+                await websocket.send_json({"type": "error", "message": str(e)})
+    except WebSocketDisconnect:
+        pass
+
+# Speech recognition pool, recognizers are reused per worker thread
+stt_executor = ThreadPoolExecutor(max_workers=STT_WORKERS, thread_name_prefix="stt")
+
+def audio_from_bytes(data: bytes, sample_rate: int = STT_SAMPLE_RATE,
+                     sample_width: int = STT_SAMPLE_WIDTH) -> "sr.AudioData":
+    """WAV, AIFF or FLAC file bytes, or raw mono PCM, as AudioData without touching the filesystem"""
+    if data[:4] in (b"RIFF", b"FORM", b"fLaC"):
+        with sr.AudioFile(io.BytesIO(data)) as source:
+            return get_recognizer().record(source)
+    return sr.AudioData(data, sample_rate, sample_width)
+
+def transcribe(data: bytes, language: str = "en-US", backend=None) -> str:
+    """Transcribe audio bytes, see audio_from_bytes"""
+    audio = audio_from_bytes(data)
+    backend = backend or get_stt_backend()
+    return backend.transcribe(audio.frame_data, audio.sample_rate, audio.sample_width, language)
+
+async def transcribe_async(data: bytes, language: str = "en-US", backend=None) -> str:
+    """Transcribe audio bytes on the speech recognition pool"""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(stt_executor, transcribe, data, language, backend)
+
+class VoiceStreamSession:
+    """
+    Streaming transcription for one /ws/voice connection.
+    
+    PCM chunks are segmented into utterances by voice activity detection.
+    While an utterance is in progress, the audio so far is transcribed again
+    every STT_PARTIAL_INTERVAL_MS (one transcription at a time) and sent as a
+    partial transcript; when it ends, the whole utterance is transcribed and
+    sent as the final transcript. All messages are sent from the receive
+    loop, so they never interleave.
+    """
+    
+    def __init__(self, websocket: WebSocket, backend, sample_rate: int = STT_SAMPLE_RATE,
+                 language: str = "en-US"):
+        self.websocket = websocket
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.language = language
+        self.segmenter = VoiceSegmenter(sample_rate, silence_ms=VAD_SILENCE_MS,
+                                        threshold_ratio=VAD_THRESHOLD_RATIO)
+        self.utterance_id = 0
+        self._partial = None  # (utterance id, future) of the running partial transcription
+        self._partial_ms = 0
+    
+    async def _transcribe(self, pcm: bytes) -> str:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(stt_executor, self.backend.transcribe, pcm, self.sample_rate,
+                                          STT_SAMPLE_WIDTH, self.language)
+    
+    async def feed(self, pcm: bytes) -> bool:
+        """Process a PCM chunk, returning True if a final transcript asked to end the session"""
+        for event, audio in self.segmenter.feed(pcm):
+            if event == "start":
+                self.utterance_id += 1
+                self._partial_ms = 0
+                await self.websocket.send_json({"type": "speech_start", "utterance": self.utterance_id})
+            elif await self._final(audio):
+                return True
+        
+        await self._send_partial()
+        if (self.segmenter.in_speech and self._partial is None and
+                self.segmenter.utterance_ms - self._partial_ms >= STT_PARTIAL_INTERVAL_MS):
+            self._partial_ms = self.segmenter.utterance_ms
+            self._partial = (self.utterance_id, asyncio.ensure_future(self._transcribe(self.segmenter.utterance)))
+        return False
+    
+    async def _send_partial(self):
+        """Send the running partial transcript once it is ready, if its utterance is still in progress"""
+        if self._partial is None or not self._partial[1].done():
+            return
+        utterance_id, future = self._partial
+        self._partial = None
+        try:
+            text = future.result()
+        except Exception as e:
+            logger.warning(f"Partial transcription failed: {str(e)}")
+            return
+        if text and utterance_id == self.utterance_id and self.segmenter.in_speech:
+            await self.websocket.send_json({"type": "partial", "utterance": utterance_id, "text": text})
+    
+    async def _final(self, audio: bytes) -> bool:
+        """Transcribe and send a finished utterance, returning True if it is an exit word"""
+        self.cancel()
+        text = await self._transcribe(audio)
+        await self.websocket.send_json({"type": "final", "utterance": self.utterance_id, "text": text})
+        return text.strip().lower() in VOICE_EXIT_WORDS
+    
+    async def finish(self) -> bool:
+        """End the utterance in progress, see feed"""
+        audio = self.segmenter.flush()
+        if audio:
+            return await self._final(audio)
+        return False
+    
+    def cancel(self):
+        """Drop the running partial transcription"""
+        if self._partial is not None:
+            self._partial[1].cancel()
+            self._partial = None
+
+def voice_stream_options(control: Dict[str, Any]):
+    """Backend, sample rate and language of a streaming start message, raising ValueError if invalid"""
+    sample_rate = control.get("sample_rate")
+    if sample_rate is None:
+        sample_rate = STT_SAMPLE_RATE
+    if isinstance(sample_rate, bool) or not isinstance(sample_rate, int) or not 8000 <= sample_rate <= 48000:
+        raise ValueError("sample_rate must be an integer between 8000 and 48000")
+    language = control.get("language") or "en-US"
+    if not isinstance(language, str):
+        raise ValueError("language must be a string")
+    return get_stt_backend(control.get("backend")), sample_rate, language
+
 @app.post("/api/stt")
 async def speech_to_text(request: STTRequest):
     """Convert speech to text"""
+    try:
+        backend = get_stt_backend(request.backend)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         import base64
-        import tempfile
-        import wave
         
-        # Decode base64 audio data
+        # Decode base64 audio data, 16 kHz 16-bit mono PCM or an audio file
         audio_data = base64.b64decode(request.audio_data)
         
-        # Save to temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            with wave.open(temp_file.name, 'wb') as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)
-                wav_file.setframerate(16000)
-                wav_file.writeframes(audio_data)
-        
-        # Initialize speech recognition
-        recognizer = sr.Recognizer()
-        
-        # Convert speech to text
-        with sr.AudioFile(temp_file.name) as source:
-            audio = recognizer.record(source)
-            text = recognizer.recognize_google(audio, language=request.language)
-        
-        # Clean up temporary file
-        os.unlink(temp_file.name)
+        # Convert speech to text in memory, off the event loop
+        text = await transcribe_async(audio_data, request.language, backend)
         
         return {
             "success": True,
@@ -703,25 +1651,65 @@ async def speech_to_text(request: STTRequest):
 
 @app.websocket("/ws/voice")
 async def voice_websocket(websocket: WebSocket):
-    """WebSocket endpoint for real-time voice communication"""
+    """
+    WebSocket endpoint for real-time voice communication.
+    
+    By default each binary message is one complete utterance (an audio file or
+    raw 16 kHz 16-bit mono PCM) answered with a "transcript" message.
+    
+    Sending {"type": "start", "mode": "stream", "sample_rate": ..., "language": ...,
+    "backend": ...} switches to streaming: binary messages are then small chunks
+    of 16-bit mono PCM, speech is segmented on the server and the client gets
+    "speech_start", "partial" and "final" messages per utterance.
+    {"type": "stop"} ends the utterance in progress and leaves streaming mode.
+    Invalid control messages are answered with an "error" message.
+    """
     await websocket.accept()
+    session = None
     
     try:
         while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            
+            # Control messages
+            if message.get("text") is not None:
+                # A bad control message is reported and the connection kept open
+                try:
+                    control = json.loads(message["text"])
+                    if not isinstance(control, dict):
+                        raise ValueError("Control messages must be JSON objects")
+                    starting = control.get("type") == "start" and control.get("mode") == "stream"
+                    if starting:
+                        backend, sample_rate, language = voice_stream_options(control)
+                except ValueError as e:
+                    await websocket.send_json({"type": "error", "message": str(e)})
+                    continue
+                
+                if starting:
+                    if session is not None:
+                        session.cancel()
+                    session = VoiceStreamSession(websocket, backend, sample_rate=sample_rate, language=language)
+                    await websocket.send_json({"type": "ready", "backend": session.backend.name,
+                                               "sample_rate": session.sample_rate})
+                elif control.get("type") == "stop" and session is not None:
+                    done = await session.finish()
+                    session = None
+                    if done:
+                        break
+                continue
+            
             # Receive audio data from client
-            data = await websocket.receive_bytes()
+            data = message.get("bytes") or b""
             
-            # Initialize speech recognition
-            recognizer = sr.Recognizer()
+            if session is not None:
+                if await session.feed(data):
+                    break
+                continue
             
-            # Convert audio data to text
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as temp_file:
-                temp_file.write(data)
-                temp_file.flush()
-                
-                with sr.AudioFile(temp_file.name) as source:
-                    audio = recognizer.record(source)
-                    text = recognizer.recognize_google(audio)
+            # Convert audio data to text in memory, off the event loop
+            text = await transcribe_async(data)
             
             # Send text back to client
             await websocket.send_json({
@@ -730,9 +1718,11 @@ async def voice_websocket(websocket: WebSocket):
             })
             
             # Process the command if needed
-            if text.strip().lower() in ["exit", "quit", "stop"]:
+            if text.strip().lower() in VOICE_EXIT_WORDS:
                 break
-                
+    
+    except WebSocketDisconnect:
+        return
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         await websocket.send_json({
@@ -740,7 +1730,23 @@ async def voice_websocket(websocket: WebSocket):
             "message": str(e)
         })
     finally:
-        await websocket.close()
+        if session is not None:
+            session.cancel()
+    await websocket.close()
+
+@app.post("/rag/reload")
+async def rag_reload():
+    """Reload the RAG engine, e.g. after the vector index was rebuilt"""
+    if not rag_available:
+        return {"success": False, "message": "RAG engine is not available"}
+    
+    try:
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, rag_engine.get_rag_engine().reload)
+        return {"success": True, "message": "RAG engine reloaded"}
+    except Exception as e:
+        logger.error(f"Error reloading RAG engine: {str(e)}")
+        return {"success": False, "message": f"Error: {str(e)}"}
 
 @app.get("/last-command")
 async def get_last_command():
@@ -1,6 +1,7 @@
 import os
 import logging
 import time
+import threading
 import gradio as gr
 from typing import Dict, Any, Optional
 from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
@@ -15,6 +16,10 @@ logger = logging.getLogger("aura-api")
 # Model configuration
 MODEL_NAME = os.environ.get("MODEL_NAME", "naxwinn/qlora-jarvis-output")
 
+# Health monitoring configuration
+HEALTH_CHECK_INTERVAL = int(os.environ.get("HEALTH_CHECK_INTERVAL", "10"))
+HEALTH_PROBE_IDLE_SECONDS = int(os.environ.get("HEALTH_PROBE_IDLE_SECONDS", "120"))
+
 # Global state for model
 model = None
 tokenizer = None
@@ -28,6 +33,8 @@ model_status = {
     "memory_usage": None,
     "load": None
 }
+last_activity = 0
+health_monitor_started = False
 
 def load_model():
     """Load the model"""
@@ -46,6 +53,7 @@ def load_model():
             "model": MODEL_NAME,
         })
         logger.info("Model loaded successfully")
+        start_health_monitor()
         return "Model loaded successfully"
     except Exception as e:
         model_loaded = False
@@ -59,52 +67,49 @@ def load_model():
         logger.error(error_msg)
         return error_msg
 
+def record_outcome(success, error=None):
+    """Update the model status from the outcome of a real request or probe"""
+    global last_activity
+    last_activity = time.time()
+    model_status.update({
+        "last_checked": last_activity,
+        "online": success,
+        "status": "Model is online" if success else f"Error: {error}",
+        "model": MODEL_NAME,
+        "provider": "Hugging Face",
+    })
+
+def probe_model():
+    """Generate a single token to check that the model still responds"""
+    inputs = tokenizer("Hello", return_tensors="pt")
+    model.generate(**inputs, max_new_tokens=1, pad_token_id=tokenizer.eos_token_id)
+
+def health_monitor():
+    """Probe the model in the background, but only after it has been idle for a while"""
+    while True:
+        time.sleep(HEALTH_CHECK_INTERVAL)
+        if not model_loaded or time.time() - last_activity < HEALTH_PROBE_IDLE_SECONDS:
+            continue
+        try:
+            probe_model()
+            record_outcome(True)
+        except Exception as e:
+            logger.error(f"Error checking model status: {str(e)}")
+            record_outcome(False, str(e))
+
+def start_health_monitor():
+    """Start the background health monitor once"""
+    global health_monitor_started
+    if health_monitor_started:
+        return
+    health_monitor_started = True
+    threading.Thread(target=health_monitor, daemon=True).start()
+
 def check_model_status():
-    """Check if the model is available"""
-    global model_status
-    
-    # Don't check more often than every 10 seconds
-    current_time = time.time()
-    if current_time - model_status["last_checked"] < 10:
-        status_text = f"Model: {model_status['model']}\nStatus: {'Online' if model_status['online'] else 'Offline'}\nLast checked: {time.ctime(model_status['last_checked'])}"
-        return status_text
-    
-    try:
-        if not model_loaded or model is None or tokenizer is None:
-            raise ValueError("Model not properly initialized")
-            
-        # Simple test query to check if the model is responsive
-        test_input = "Hello"
-        test_prompt = f"User: {test_input}\n\nAssistant:"
-        
-        _ = generator(
-            test_prompt,
-            max_length=50,
-            num_return_sequences=1,
-            pad_token_id=tokenizer.eos_token_id,
-            temperature=0.7
-        )
-        
-        model_status.update({
-            "last_checked": current_time,
-            "online": True,
-            "status": "Model is online",
-            "model": MODEL_NAME,
-            "provider": "Hugging Face",
-        })
-    except Exception as e:
-        logger.error(f"Error checking model status: {str(e)}")
-        model_status.update({
-            "last_checked": current_time,
-            "online": False,
-            "status": f"Error: {str(e)}",
-            "provider": "Hugging Face",
-            "model": MODEL_NAME
-        })
-    
+    """Get the cached model status, derived from recent requests and idle probes"""
     status_text = f"Model: {model_status['model']}\nStatus: {'Online' if model_status['online'] else 'Offline'}\nLast checked: {time.ctime(model_status['last_checked'])}"
     if not model_status['online']:
-        status_text += f"\nError: {model_status['status']}"
+        status_text += f"\nError: {model_status.get('status', 'Model not loaded')}"
     
     return status_text
 
@@ -139,10 +144,13 @@ def query_model(prompt, system_prompt=None):
         generated_text = response[0]['generated_text']
         answer = generated_text.split("Assistant:", 1)[-1].strip()
         
+        record_outcome(True)
         return answer
     except Exception as e:
         error_msg = f"Error: {str(e)}"
         logger.error(f"Error querying model: {str(e)}")
+        if model_loaded:
+            record_outcome(False, str(e))
         return error_msg
 
 def execute_command(command):
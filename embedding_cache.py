@@ -0,0 +1,151 @@
+"""
+Embedding Cache - Cache of query embeddings for the RAG engine
+
+Recurring questions are embedded once. Vectors are kept in a bounded
+in-process LRU and, optionally, in a SQLite file shared by every process
+on the machine (API server workers, the Jarvis service, ingestion runs).
+Entries are keyed by embedding model and normalized query text, so a model
+change never serves stale vectors.
+"""
+import time
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from langchain.embeddings.base import Embeddings
+
+
+def normalize_query(text: str) -> str:
+    """Lower-case the query, collapse whitespace and strip surrounding punctuation"""
+    return " ".join(text.lower().split()).strip(" ?!.,;:")
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of query embeddings with an optional shared on-disk tier"""
+
+    def __init__(self, model_name: str, max_entries: int = 1024, disk_path: Optional[str] = None,
+                 max_disk_entries: int = 100000):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+        self._disk = None
+        self._disk_writes = 0
+        if disk_path:
+            self._open_disk(disk_path)
+
+    def _open_disk(self, path: str) -> None:
+        # WAL lets several processes read while one writes
+        self._disk = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._disk.execute("PRAGMA journal_mode=WAL")
+        self._disk.execute(
+            "CREATE TABLE IF NOT EXISTS query_embeddings ("
+            "model TEXT NOT NULL, query TEXT NOT NULL, vector BLOB NOT NULL, created REAL NOT NULL, "
+            "PRIMARY KEY (model, query))"
+        )
+        self._disk.commit()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """The cached embedding of a normalized query, or None"""
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return vector
+
+            if self._disk is not None:
+                try:
+                    row = self._disk.execute(
+                        "SELECT vector FROM query_embeddings WHERE model = ? AND query = ?",
+                        (self.model_name, key)
+                    ).fetchone()
+                except sqlite3.Error:
+                    row = None
+                if row is not None:
+                    vector = array("f", row[0]).tolist()
+                    self._remember(key, vector)
+                    self._stats["disk_hits"] += 1
+                    return vector
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, vector: List[float]) -> None:
+        """Cache the embedding of a normalized query in both tiers"""
+        with self._lock:
+            self._remember(key, vector)
+            if self._disk is None:
+                return
+            try:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (model, query, vector, created) VALUES (?, ?, ?, ?)",
+                    (self.model_name, key, array("f", vector).tobytes(), time.time())
+                )
+                self._disk_writes += 1
+                if self._disk_writes % 1000 == 0:
+                    self._prune_disk()
+                self._disk.commit()
+            except sqlite3.Error:
+                # Another process holding the lock only costs a future disk hit
+                self._disk.rollback()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _prune_disk(self) -> None:
+        """Drop the oldest on-disk entries beyond the size limit"""
+        self._disk.execute(
+            "DELETE FROM query_embeddings WHERE rowid IN ("
+            "SELECT rowid FROM query_embeddings ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+
+    def clear(self) -> None:
+        """Empty the in-process tier"""
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, hits per tier, misses and hit ratios"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats["memory_hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        stats["disk_enabled"] = self._disk is not None
+        return stats
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper serving query embeddings from a QueryEmbeddingCache"""
+
+    def __init__(self, embeddings: Embeddings, cache: QueryEmbeddingCache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Chunks are embedded once at indexing time, caching them gains nothing
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = normalize_query(text)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(key)
+            self.cache.put(key, vector)
+        return vector
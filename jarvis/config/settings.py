@@ -18,6 +18,25 @@ WAKE_WORDS = ['jarvis', 'gervais', 'service']
 WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')
 NEWS_API_KEY = os.getenv('NEWS_API_KEY')
 
+# API endpoints, overridable to point the services at a local stub server
+WEATHER_API_URL = os.getenv('WEATHER_API_URL', 'http://api.openweathermap.org/data/2.5/weather')
+NEWS_API_URL = os.getenv('NEWS_API_URL', 'https://newsapi.org/v2/top-headlines')
+
+# HTTP settings
+HTTP_TIMEOUT = (3.05, 10)  # Connect and read timeouts in seconds for API requests
+HTTP_POOL_SIZE = 8  # Pooled connections per host, also the number of fan-out workers
+
+# API response cache settings
+WEATHER_CACHE_TTL = 600  # Seconds a weather report is fresh
+NEWS_CACHE_TTL = 900  # Seconds news headlines are fresh
+API_CACHE_STALE_TTL = 3600  # Further seconds an expired response is served while it is refreshed
+API_CACHE_DIR = os.getenv('JARVIS_CACHE_DIR')  # Directory for the on-disk cache tier, disabled if unset
+
+# Morning briefing settings
+DEFAULT_CITY = 'new york'  # City used when a weather command names none
+BRIEFING_TIMEOUT = 12  # Seconds to wait for all parts of a briefing
+BRIEFING_MAX_REMINDERS = 3  # Maximum number of reminders read out in a briefing
+
 # Ollama settings
 OLLAMA_MODEL = 'gemma:2b'
 OLLAMA_CUSTOM_MODELS = {
@@ -30,6 +49,12 @@ OLLAMA_CUSTOM_MODELS = {
 # RAG settings
 USE_RAG_FOR_COLLEGE = True  # Set to False to disable RAG for college queries
 
+# Response cache settings
+RESPONSE_CACHE_SIZE = 200  # Maximum number of cached responses
+RESPONSE_CACHE_TTL = 3600  # Seconds before a cached response expires
+RESPONSE_CACHE_SIMILARITY = 0.92  # Minimum similarity for a paraphrased query to hit the cache
+RESPONSE_CACHE_MAX_BYTES = 8 * 1024 * 1024  # Approximate memory limit of the cache
+
 # Website shortcuts
 WEBSITES = {
     'youtube': 'https://youtube.com',
@@ -46,5 +71,7 @@ VOLUME_STEP = 2000  # Volume change step for NirCmd
 
 # Conversation settings
 MAX_HISTORY_LENGTH = 5  # Maximum number of conversation turns to remember
+MAX_CONTEXT_TOKENS = 2048  # Maximum number of Ollama context tokens carried between turns
+MAX_CONTEXT_SESSIONS = 32  # Maximum number of conversations whose Ollama context is kept
 CONVERSATION_TIMEOUT = 30  # Seconds to keep conversation active after last interaction
 CONTINUOUS_MODE = True  # Enable continuous conversation mode without wake word
\ No newline at end of file
@@ -8,6 +8,9 @@ This module processes and executes different voice commands.
 import datetime
 import re
 
+from config.settings import WAKE_WORDS, DEFAULT_CITY
+from core.intent_router import command_router
+from core.profile_manager import ProfileManager
 from services.weather import WeatherService
 from services.news import NewsService
 from services.media import MediaService
@@ -15,18 +18,26 @@ from services.browser import BrowserService
 from services.system import SystemService
 from services.llm import LLMService
 from services.web_search import WebSearchService
+from services.briefing import BriefingService
+from services import http_client
+
+# Argument extraction patterns, compiled once
+SEARCH_QUERY_PATTERN = re.compile(r'search (for|on)?\s+(.*?)( on| using| with)? ?(google|bing|duckduckgo|youtube)?$')
+CLOSE_KEYWORD_PATTERN = re.compile(r'(close|exit|quit)\s+')
 
 class CommandHandler:
     """
     Processes and executes different voice commands.
     """
     
-    def __init__(self, speech_engine):
+    def __init__(self, speech_engine, profile_manager=None):
         """
         Initialize the command handler with required services.
         
         Args:
             speech_engine: The speech engine for text-to-speech output
+            profile_manager (optional): Profile manager providing get_reminders for the briefing,
+                a core.profile_manager.ProfileManager by default
         """
         self.speech_engine = speech_engine
         
@@ -38,6 +49,38 @@ class CommandHandler:
         self.system_service = SystemService()
         self.llm_service = LLMService()
         self.web_search_service = WebSearchService()
+        # The briefing reads the current user's open reminders
+        if not hasattr(profile_manager, 'get_reminders'):
+            profile_manager = ProfileManager()
+        self.profile_manager = profile_manager
+        self.briefing_service = BriefingService(
+            self.weather_service,
+            self.news_service,
+            get_reminders=self.profile_manager.get_reminders
+        )
+        
+        # Intent name -> handler, see core.intent_router.COMMAND_INTENTS
+        self._handlers = {
+            'greeting': self._handle_greeting,
+            'how_are_you': self._handle_how_are_you,
+            'help': self._handle_help,
+            'system_status': self._handle_system_status,
+            'play': self._handle_play,
+            'time': self._handle_time,
+            'who_is': self._handle_who_is,
+            'joke': self._handle_joke,
+            'weather': self._handle_weather,
+            'news': self._handle_news,
+            'briefing': self._handle_briefing,
+            'mute': self._handle_mute,
+            'unmute': self._handle_unmute,
+            'volume_up': self._handle_volume_up,
+            'volume_down': self._handle_volume_down,
+            'search': self._handle_search,
+            'close': self._handle_close,
+            'open': self._handle_open,
+            'exit': self._handle_exit,
+        }
     
     def process_command(self, command):
         """
@@ -50,154 +93,166 @@ class CommandHandler:
             bool: False if the assistant should exit, True or None otherwise
         """
         print(f"Processing command: {command}")
+        command = command.lower()
         
-        # Basic interaction commands
-        if any(word in command.lower() for word in ['hello', 'hi', 'hey']):  # Greetings
-            self.speech_engine.speak('Hello! How can I help you today?')
-            
-        elif any(word in command.lower() for word in ['how are you', 'how\'re you']):  # Status query
-            self.speech_engine.speak('I\'m functioning well and ready to assist you!')
-            
-        elif 'help' in command.lower():  # Help command
-            help_text = (
-                'I can help you with various tasks like:\n'
-                '- Playing music ("play [song name]")\n'
-                '- Checking weather ("weather in [city]")\n'
-                '- Getting news ("tell me the news")\n'
-                '- Searching the web ("search for [query]")\n'
-                '- Controlling volume ("volume up/down")\n'
-                '- Opening websites ("open [website]")\n'
-                '- Closing applications ("close [app]")\n'
-                '- Telling time ("what\'s the time")\n'
-                'Feel free to ask me anything!'
-            )
-            self.speech_engine.speak(help_text)
-            
-        # System status commands
-        elif any(phrase in command.lower() for phrase in ['system status', 'status report']):  # System status
-            status = self.system_service.get_system_status()
-            self.speech_engine.speak(f'System status: {status}')
-            
-        # Media commands
-        elif 'play' in command:
-            song = command.replace('play', '').strip()
-            self.speech_engine.speak(f'Playing {song}')
-            self.media_service.play_youtube(song)
-        
-        # Time commands
-        elif 'time' in command:
-            time = datetime.datetime.now().strftime('%I:%M %p')
-            self.speech_engine.speak(f'Current time is {time}')
-        
-        # Wikipedia commands
-        elif 'who is' in command:
-            person = command.replace('who is', '').strip()
-            info = self.llm_service.search_wikipedia(person)
-            self.speech_engine.speak(info)
-        
-        # Joke commands
-        elif 'joke' in command:
-            joke = self.llm_service.get_joke()
-            self.speech_engine.speak(joke)
-        
-        # Weather commands
-        elif 'weather' in command:
-            city = command.replace('weather', '').strip() or 'new york'
-            weather_report = self.weather_service.get_weather(city)
-            self.speech_engine.speak(weather_report)
-        
-        # News commands
-        elif 'news' in command:
-            news = self.news_service.get_headlines()
-            self.speech_engine.speak(news)
+        # Dispatch to the handler of the highest-priority matching intent, default: ask LLM
+        intent = command_router.route(command)
+        handler = self._handlers.get(intent, self._handle_llm)
+        return handler(command)
+    
+    # Basic interaction commands
+    def _handle_greeting(self, command):
+        self.speech_engine.speak('Hello! How can I help you today?')
+    
+    def _handle_how_are_you(self, command):
+        self.speech_engine.speak('I\'m functioning well and ready to assist you!')
+    
+    def _handle_help(self, command):
+        help_text = (
+            'I can help you with various tasks like:\n'
+            '- Playing music ("play [song name]")\n'
+            '- Checking weather ("weather in [city]")\n'
+            '- Getting news ("tell me the news")\n'
+            '- Morning briefing of weather, news and reminders ("morning briefing")\n'
+            '- Searching the web ("search for [query]")\n'
+            '- Controlling volume ("volume up/down")\n'
+            '- Opening websites ("open [website]")\n'
+            '- Closing applications ("close [app]")\n'
+            '- Telling time ("what\'s the time")\n'
+            'Feel free to ask me anything!'
+        )
+        self.speech_engine.speak(help_text)
+    
+    # System status commands
+    def _handle_system_status(self, command):
+        status = self.system_service.get_system_status()
+        self.speech_engine.speak(f'System status: {status}')
+    
+    # Media commands
+    def _handle_play(self, command):
+        song = command.replace('play', '').strip()
+        self.speech_engine.speak(f'Playing {song}')
+        self.media_service.play_youtube(song)
+    
+    # Time commands
+    def _handle_time(self, command):
+        time = datetime.datetime.now().strftime('%I:%M %p')
+        self.speech_engine.speak(f'Current time is {time}')
+    
+    # Wikipedia commands
+    def _handle_who_is(self, command):
+        person = command.replace('who is', '').strip()
+        info = self.llm_service.search_wikipedia(person)
+        self.speech_engine.speak(info)
+    
+    # Joke commands
+    def _handle_joke(self, command):
+        joke = self.llm_service.get_joke()
+        self.speech_engine.speak(joke)
+    
+    # Weather commands
+    def _handle_weather(self, command):
+        city = command.replace('weather', '').strip() or DEFAULT_CITY
+        weather_report = self.weather_service.get_weather(city)
+        self.speech_engine.speak(weather_report)
+    
+    # News commands
+    def _handle_news(self, command):
+        news = self.news_service.get_headlines()
+        self.speech_engine.speak(news)
+    
+    # Briefing commands
+    def _handle_briefing(self, command):
+        self.speech_engine.speak(self.briefing_service.get_briefing())
+    
+    # Volume commands
+    def _handle_mute(self, command):
+        self.system_service.mute()
+        self.speech_engine.speak('Audio muted')
+    
+    def _handle_unmute(self, command):
+        self.system_service.unmute()
+        self.speech_engine.speak('Audio unmuted')
+    
+    def _handle_volume_up(self, command):
+        self.system_service.volume_up()
+        self.speech_engine.speak('Increasing volume')
+    
+    def _handle_volume_down(self, command):
+        self.system_service.volume_down()
+        self.speech_engine.speak('Decreasing volume')
+    
+    # Web search commands
+    def _handle_search(self, command):
+        # Extract search query and optional engine
+        search_pattern = SEARCH_QUERY_PATTERN.search(command)
         
-        # Volume commands
-        elif any(phrase in command.lower() for phrase in ['mute', 'silence']):  # Mute
-            self.system_service.mute()
-            self.speech_engine.speak('Audio muted')
-            
-        elif any(phrase in command.lower() for phrase in ['unmute', 'sound on']):  # Unmute
-            self.system_service.unmute()
-            self.speech_engine.speak('Audio unmuted')
-            
-        elif 'volume up' in command:
-            self.system_service.volume_up()
-            self.speech_engine.speak('Increasing volume')
+        if search_pattern:
+            query = search_pattern.group(2).strip()
+            engine = search_pattern.group(4) if search_pattern.group(4) else None
+        else:
+            query = command.replace('search', '', 1).strip()
+            engine = None
         
-        elif 'volume down' in command:
-            self.system_service.volume_down()
-            self.speech_engine.speak('Decreasing volume')
+        if query:
+            engine_text = f" on {engine}" if engine else ""
+            self.speech_engine.speak(f"Searching{engine_text} for {query}")
+            self.web_search_service.search(query, engine)
+        else:
+            self.speech_engine.speak("What would you like me to search for?")
+    
+    # Close application commands
+    def _handle_close(self, command):
+        # First remove close/exit/quit keywords
+        app_name = CLOSE_KEYWORD_PATTERN.sub('', command).strip()
         
-        # Web search commands
-        elif re.search(r'search (for|on)\s+', command) or command.startswith('search '):
-            # Extract search query and optional engine
-            search_pattern = re.search(r'search (for|on)?\s+(.*?)( on| using| with)? ?(google|bing|duckduckgo|youtube)?$', command)
-            
-            if search_pattern:
-                query = search_pattern.group(2).strip()
-                engine = search_pattern.group(4) if search_pattern.group(4) else None
-            else:
-                query = command.replace('search', '', 1).strip()
-                engine = None
-            
-            if query:
-                engine_text = f" on {engine}" if engine else ""
-                self.speech_engine.speak(f"Searching{engine_text} for {query}")
-                self.web_search_service.search(query, engine)
-            else:
-                self.speech_engine.speak("What would you like me to search for?")
+        # Then remove any wake words that might be in the command
+        for wake_word in WAKE_WORDS:
+            if app_name.lower().startswith(wake_word.lower()):
+                app_name = app_name[len(wake_word):].strip()
         
-        # Close application commands
-        elif re.search(r'close|exit|quit', command) and not (command == 'exit' or command == 'quit' or 'goodbye' in command):
-            # First remove close/exit/quit keywords
-            app_name = re.sub(r'(close|exit|quit)\s+', '', command).strip()
-            
-            # Then remove any wake words that might be in the command
-            from config.settings import WAKE_WORDS
-            for wake_word in WAKE_WORDS:
-                if app_name.lower().startswith(wake_word.lower()):
-                    app_name = app_name[len(wake_word):].strip()
-            
-            if app_name:
-                # Provide better feedback for browser tabs
-                if app_name.lower() in ['youtube', 'facebook', 'twitter', 'instagram', 'gmail']:
-                    self.speech_engine.speak(f"Trying to close {app_name}...")
-                    if self.system_service.close_application(app_name):
-                        self.speech_engine.speak(f"Successfully closed {app_name}")
-                    else:
-                        self.speech_engine.speak(f"I couldn't find an open {app_name} tab")
-                # Regular applications
+        if app_name:
+            # Provide better feedback for browser tabs
+            if app_name.lower() in ['youtube', 'facebook', 'twitter', 'instagram', 'gmail']:
+                self.speech_engine.speak(f"Trying to close {app_name}...")
+                if self.system_service.close_application(app_name):
+                    self.speech_engine.speak(f"Successfully closed {app_name}")
                 else:
-                    if self.system_service.close_application(app_name):
-                        self.speech_engine.speak(f"Closed {app_name}")
-                    else:
-                        self.speech_engine.speak(f"Could not find {app_name} running")
+                    self.speech_engine.speak(f"I couldn't find an open {app_name} tab")
+            # Regular applications
             else:
-                self.speech_engine.speak("Which application would you like me to close?")
-        
-        # Browser commands
-        elif 'open' in command:
-            for site in self.browser_service.get_available_sites():
-                if site in command:
-                    self.speech_engine.speak(f'Opening {site}')
-                    self.browser_service.open_website(site)
-                    return
-            self.speech_engine.speak("Website not in my database")
-        
-        # Exit commands
-        elif command.strip().lower() in ['exit', 'quit'] or 'exit' in command or 'goodbye' in command or 'bye' in command:
-            self.speech_engine.speak("Goodbye!")
-            # Stop the speech engine's display window first
-            if hasattr(self.speech_engine, 'display_window') and self.speech_engine.display_window:
-                self.speech_engine.display_window.stop()
-            # Signal main loop to stop
-            return False
-        
-        # Default: Ask LLM
+                if self.system_service.close_application(app_name):
+                    self.speech_engine.speak(f"Closed {app_name}")
+                else:
+                    self.speech_engine.speak(f"Could not find {app_name} running")
         else:
-            try:
-                response = self.llm_service.ask(command)
-            except Exception as e:
-                print(f"Error in llm_service.ask: {e}")
-                response = f"Sorry, I encountered an error: {e}"
-            self.speech_engine.speak(response)
\ No newline at end of file
+            self.speech_engine.speak("Which application would you like me to close?")
+    
+    # Browser commands
+    def _handle_open(self, command):
+        for site in self.browser_service.get_available_sites():
+            if site in command:
+                self.speech_engine.speak(f'Opening {site}')
+                self.browser_service.open_website(site)
+                return
+        self.speech_engine.speak("Website not in my database")
+    
+    # Exit commands
+    def _handle_exit(self, command):
+        self.speech_engine.speak("Goodbye!")
+        # Stop the speech engine's display window first
+        if hasattr(self.speech_engine, 'display_window') and self.speech_engine.display_window:
+            self.speech_engine.display_window.stop()
+        # Release pooled connections and the fan-out workers
+        http_client.close()
+        # Signal main loop to stop
+        return False
+    
+    # Default: Ask LLM
+    def _handle_llm(self, command):
+        try:
+            response = self.llm_service.ask(command)
+        except Exception as e:
+            print(f"Error in llm_service.ask: {e}")
+            response = f"Sorry, I encountered an error: {e}"
+        self.speech_engine.speak(response)
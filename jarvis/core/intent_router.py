@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Jarvis Voice Assistant - Intent Router Module
+
+This module maps voice commands to intents using a declarative intent table
+compiled into a single regular expression.
+"""
+
+import re
+import time
+
+# Intent table: (intent, priority, patterns). Lower priority values win when a
+# command matches several intents. An intent may appear more than once to give
+# some of its phrasings a different priority.
+COMMAND_INTENTS = [
+    ('exit', 10, [r'^(?:exit|quit)$', r'\bgoodbye\b', r'\bbye\b']),
+    ('system_status', 20, [r'\bsystem status\b', r'\bstatus report\b']),
+    ('how_are_you', 20, [r'\bhow are you\b', r"\bhow're you\b"]),
+    ('volume_up', 30, [r'\bvolume up\b']),
+    ('volume_down', 30, [r'\bvolume down\b']),
+    ('unmute', 30, [r'\bunmute\b', r'\bsound on\b']),
+    ('mute', 31, [r'\bmute\b', r'\bsilence\b']),
+    ('search', 40, [r'\bsearch (?:for|on)\s+', r'^search ']),
+    ('who_is', 40, [r'\bwho is\b']),
+    ('briefing', 45, [r'\b(?:morning|daily) briefing\b', r'\bbrief me\b']),
+    ('weather', 50, [r'\bweather\b']),
+    ('news', 50, [r'\bnews\b']),
+    ('joke', 50, [r'\bjokes?\b']),
+    ('time', 55, [r"\bwhat(?:'s| is) the time\b", r'\bwhat time is it\b', r'\btell me the time\b', r'\bcurrent time\b']),
+    ('play', 60, [r'\bplay\b']),
+    ('time', 65, [r'\btime\b']),
+    ('close', 70, [r'\b(?:close|exit|quit)\b']),
+    ('open', 70, [r'\bopen\b']),
+    ('help', 80, [r'\bhelp\b']),
+    ('greeting', 90, [r'\b(?:hello|hi|hey)\b']),
+]
+
+
+class IntentRouter:
+    """
+    Routes a command to the highest-priority matching intent.
+
+    All patterns are compiled into one alternation of lookaheads, so a single
+    scan over the command finds every intent that matches at any word start.
+    Patterns must begin at a word boundary.
+    """
+
+    def __init__(self, intents):
+        """
+        Compile the intent table.
+
+        Args:
+            intents (list): (intent, priority, patterns) entries
+        """
+        entries = sorted(
+            ((priority, name, pattern) for name, priority, patterns in intents for pattern in patterns),
+            key=lambda entry: entry[0]
+        )
+        self._intents = {}
+        alternatives = []
+        for i, (priority, name, pattern) in enumerate(entries):
+            group = f'i{i}'
+            self._intents[group] = (name, priority)
+            alternatives.append(f'(?=(?P<{group}>{pattern}))')
+
+        # Every pattern starts at a word boundary, so other positions are rejected up front
+        self._regex = re.compile(r'\b(?:' + '|'.join(alternatives) + ')')
+        self._best_priority = entries[0][0] if entries else 0
+
+    def route(self, command):
+        """
+        Find the intent for a command.
+
+        Args:
+            command (str): The lower-cased command
+
+        Returns:
+            str: The intent name, or None if no intent matches
+        """
+        best = None
+        for match in self._regex.finditer(command):
+            name, priority = self._intents[match.lastgroup]
+            if best is None or priority < best[1]:
+                best = (name, priority)
+                if priority == self._best_priority:
+                    break
+        return best[0] if best else None
+
+
+# Router for the voice command table, compiled once at import
+command_router = IntentRouter(COMMAND_INTENTS)
+
+
+def benchmark(router=command_router, commands=None, iterations=10000):
+    """
+    Measure routing throughput.
+
+    Args:
+        router (IntentRouter): The router to benchmark
+        commands (list, optional): Commands to route
+        iterations (int): Number of passes over the commands
+
+    Returns:
+        dict: Total routed commands, elapsed seconds and commands per second
+    """
+    commands = commands or [
+        'hello jarvis', 'play bohemian rhapsody', "what's the time", 'weather in london',
+        'tell me the news', 'volume up', 'unmute', 'search for python tutorials on youtube',
+        'close chrome', 'open youtube', 'who is alan turing', 'tell me a joke',
+        'what are the admission requirements for computer science', 'goodbye'
+    ]
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for command in commands:
+            router.route(command)
+    elapsed = time.perf_counter() - start
+
+    routed = iterations * len(commands)
+    return {
+        'commands': routed,
+        'seconds': elapsed,
+        'commands_per_second': routed / elapsed if elapsed else float('inf')
+    }
+
+
+if __name__ == '__main__':
+    result = benchmark()
+    print(f"Routed {result['commands']} commands in {result['seconds']:.3f}s "
+          f"({result['commands_per_second']:,.0f} commands/s)")
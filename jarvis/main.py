@@ -16,6 +16,7 @@ from core.theme_manager import ThemeManager
 from core.user_profiles import ProfileManager
 from core.dataset_manager import DatasetManager
 from core.display_factory import create_display
+from services import http_client
 
 # Configure logging
 logging.basicConfig(
@@ -153,6 +154,8 @@ def main():
                 logger.info("Jarvis shutdown complete.")
             except Exception as e:
                 logger.error(f"Error during shutdown: {e}")
+        # Close the HTTP session shared by the API services
+        http_client.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Jarvis Voice Assistant - Briefing Service Module
+
+This module composes the morning briefing from weather, news and reminders,
+fetched concurrently.
+"""
+
+from config.settings import DEFAULT_CITY, BRIEFING_TIMEOUT, BRIEFING_MAX_REMINDERS
+from services.http_client import fan_out
+from utils.helpers import get_greeting
+
+class BriefingService:
+    """
+    Gathers weather, news and reminders in parallel for a spoken briefing.
+    """
+
+    def __init__(self, weather_service, news_service, get_reminders=None):
+        """
+        Initialize the briefing service.
+
+        Args:
+            weather_service: Service providing get_weather(city)
+            news_service: Service providing get_headlines(country)
+            get_reminders (callable, optional): Returns the open reminders as dicts
+                with 'title' and 'due_date', e.g. ProfileManager.get_reminders
+        """
+        self.weather_service = weather_service
+        self.news_service = news_service
+        self.get_reminders = get_reminders
+
+    def _reminders_text(self):
+        """
+        Describe the open reminders.
+
+        Returns:
+            str: The reminders as a sentence, or None if there is no reminder source
+        """
+        if self.get_reminders is None:
+            return None
+
+        reminders = self.get_reminders()
+        if not reminders:
+            return "You have no reminders."
+
+        titles = [reminder.get('title', 'Untitled') for reminder in reminders[:BRIEFING_MAX_REMINDERS]]
+        more = len(reminders) - len(titles)
+        text = f"You have {len(reminders)} reminder{'s' if len(reminders) != 1 else ''}: {', '.join(titles)}"
+        if more:
+            text += f", and {more} more"
+        return text + "."
+
+    def get_briefing(self, city=DEFAULT_CITY, country='us'):
+        """
+        Compose the morning briefing.
+
+        The parts are fetched concurrently, so the briefing takes as long as the
+        slowest part rather than their sum. Parts that fail or time out are
+        reported as unavailable.
+
+        Args:
+            city (str): The city to report the weather for
+            country (str): The country code to get news for
+
+        Returns:
+            str: The briefing as spoken text
+        """
+        results = fan_out({
+            'weather': lambda: self.weather_service.get_weather(city),
+            'news': lambda: self.news_service.get_headlines(country=country),
+            'reminders': self._reminders_text
+        }, timeout=BRIEFING_TIMEOUT)
+
+        parts = [f"{get_greeting()}! Here is your briefing."]
+        for name in ('weather', 'news', 'reminders'):
+            result = results[name]
+            if isinstance(result, Exception):
+                parts.append(f"I couldn't get the {name} right now.")
+            elif result:
+                parts.append(result)
+        return " ".join(parts)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Jarvis Voice Assistant - HTTP Client Module
+
+This module provides the pooled HTTP session shared by the API services and
+runs independent service calls concurrently.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import HTTP_POOL_SIZE
+
+_session = None
+_executor = None
+_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Get the shared HTTP session, creating it on first use.
+
+    Returns:
+        requests.Session: Session reusing pooled keep-alive connections
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HTTP_POOL_SIZE, thread_name_prefix='jarvis-io')
+        return _executor
+
+
+def fan_out(calls, timeout=None):
+    """
+    Run independent calls concurrently and wait for all of them.
+
+    Args:
+        calls (dict): Name -> callable taking no arguments
+        timeout (float, optional): Seconds to wait for all calls together
+
+    Returns:
+        dict: Name -> result. Calls that raised map to the exception, calls
+            still running at the timeout map to a TimeoutError.
+    """
+    executor = _get_executor()
+    futures = {name: executor.submit(call) for name, call in calls.items()}
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            results[name] = TimeoutError(f"{name} did not finish within {timeout} seconds")
+        elif future.exception() is not None:
+            results[name] = future.exception()
+        else:
+            results[name] = future.result()
+    return results
+
+
+def close():
+    """
+    Close the shared session and stop the fan-out workers.
+    """
+    global _session, _executor
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
@@ -8,24 +8,36 @@ This module handles interactions with Ollama for AI responses.
 import ollama
 import wikipedia
 import pyjokes
-import re
 import sys
 import os
+import time
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from config.settings import OLLAMA_MODEL, OLLAMA_CUSTOM_MODELS, MAX_HISTORY_LENGTH
+from config.settings import (
+    OLLAMA_MODEL, OLLAMA_CUSTOM_MODELS, MAX_HISTORY_LENGTH, MAX_CONTEXT_TOKENS, MAX_CONTEXT_SESSIONS, CONVERSATION_TIMEOUT,
+    RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_SIMILARITY, RESPONSE_CACHE_MAX_BYTES
+)
+from utils.cache import SemanticCache
 
 # Add the root directory to sys.path to import rag_assistant
 root_dir = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 sys.path.append(str(root_dir))
 
+# Shared college topic classifier, also used by the RAG assistant
+from query_classifier import is_college_related, match_college_categories
+
 # Import the RAG assistant module
 try:
     # Ensure the rag_assistant module is properly imported
     from rag_assistant import query_rag_model, setup_vector_db
+    from rag_engine import get_rag_engine
     # Initialize the vector database when the service starts
     RAG_AVAILABLE = setup_vector_db()
     if RAG_AVAILABLE:
         print("RAG assistant initialized successfully for college queries.")
+        # Load the shared RAG engine in the background so the first college query is fast
+        threading.Thread(target=lambda: get_rag_engine().warm_up(), daemon=True).start()
     else:
         print("Failed to initialize RAG assistant. College queries will use default model.")
 except ImportError:
@@ -45,8 +57,17 @@ class LLMService:
         self.model = self.default_model
         self.custom_models = OLLAMA_CUSTOM_MODELS
         self.conversation_history = []
-        self.response_cache = {}  # Cache for common queries
-        self.cache_size_limit = 50  # Maximum number of cached responses
+        # (session_id, model) -> (context tokens, time of the turn), least recently used first
+        self.ollama_contexts = OrderedDict()
+        
+        # Cache for common queries, matching paraphrases through the RAG embedding model
+        self.response_cache = SemanticCache(
+            embed=get_rag_engine().embed_query if RAG_AVAILABLE else None,
+            max_entries=RESPONSE_CACHE_SIZE,
+            ttl=RESPONSE_CACHE_TTL,
+            similarity_threshold=RESPONSE_CACHE_SIMILARITY,
+            max_bytes=RESPONSE_CACHE_MAX_BYTES
+        )
         
         # Check if custom models are available
         self.available_models = self._get_available_models()
@@ -101,44 +122,88 @@ class LLMService:
         Returns:
             bool: True if college-related, False otherwise
         """
-        query_lower = query.lower()
+        return is_college_related(query)
+    
+    def _college_categories(self, query):
+        """
+        Get the college topics a query mentions.
+        
+        Args:
+            query (str): The user's query
+            
+        Returns:
+            list: Matched categories such as 'admissions' or 'finance', empty if not college-related
+        """
+        return match_college_categories(query)
+    
+    def _has_context(self, session_id):
+        """
+        Check whether a conversation carries Ollama context from recent turns.
+        
+        A conversation idle for more than CONVERSATION_TIMEOUT seconds is over:
+        its context is dropped and the next question starts afresh.
+        
+        Args:
+            session_id (str): The conversation to check
+            
+        Returns:
+            bool: True if any model holds live context for the session
+        """
+        now = time.time()
+        keys = [key for key in self.ollama_contexts if key[0] == session_id]
+        for key in keys:
+            if now - self.ollama_contexts[key][1] > CONVERSATION_TIMEOUT:
+                del self.ollama_contexts[key]
+        return any(key in self.ollama_contexts for key in keys)
+    
+    def _store_context(self, context_key, context):
+        """
+        Keep Ollama's context for a conversation's next turn.
+        
+        Context over MAX_CONTEXT_TOKENS is dropped rather than cut from the
+        front: cutting would change the prefix Ollama has already evaluated
+        and lose the prompt template, so the conversation starts afresh.
+        The least recently used conversations are evicted beyond
+        MAX_CONTEXT_SESSIONS.
         
-        # College-related keywords and patterns
-        college_patterns = [
-            r'\bcollege\b', r'\buniversity\b', r'\bcampus\b', r'\bschool\b',
-            r'\badmission\b', r'\badmissions\b', r'\bapply\b', r'\bapplication\b',
-            r'\bfee(s)?\b', r'\btuition\b', r'\bscholarship\b', r'\bfinancial aid\b',
-            r'\benroll(ment)?\b', r'\bcourse(s)?\b', r'\bprogram(s)?\b',
-            r'\bmajor(s)?\b', r'\bdegree(s)?\b', r'\bdorm\b', r'\bhousing\b',
-            r'\bstudent(s)?\b', r'\bfaculty\b', r'\bprofessor(s)?\b', r'\bclass(es)?\b',
-            r'\bsemester\b', r'\bquarter\b', r'\bacademic\b', r'\bstudy\b',
-            r'\bdeadline\b', r'\brequirement(s)?\b',
-            r'\btest(s)?\b', r'\bexam(s)?\b', r'\bsat\b', r'\bact\b', r'\bgpa\b', r'\bgrade(s)?\b'
-        ]
-        
-        # Check if query matches any college-related pattern
-        return any(re.search(pattern, query_lower) for pattern in college_patterns)
+        Args:
+            context_key (tuple): (session_id, model)
+            context (list): Context tokens returned by Ollama
+        """
+        if not context or len(context) > MAX_CONTEXT_TOKENS:
+            self.ollama_contexts.pop(context_key, None)
+            return
+        self.ollama_contexts[context_key] = (list(context), time.time())
+        self.ollama_contexts.move_to_end(context_key)
+        while len(self.ollama_contexts) > MAX_CONTEXT_SESSIONS:
+            self.ollama_contexts.popitem(last=False)
     
-    def ask(self, query):
+    def ask(self, query, session_id="default"):
         """
         Ask a question to the Ollama model.
         
         Args:
             query (str): The question to ask
+            session_id (str): Conversation whose Ollama context is continued
             
         Returns:
             str: The model's response
         """
         try:
-            # Check cache for exact query match
-            cache_key = query.strip().lower()
-            if cache_key in self.response_cache:
+            # Answers within an ongoing conversation depend on its earlier turns, so the
+            # shared cache is only used for questions that start a new conversation
+            use_cache = not self._has_context(session_id)
+            
+            # Check cache for the same or a paraphrased query
+            cached_response = self.response_cache.get(query) if use_cache else None
+            if cached_response is not None:
                 print("Using cached response")
-                return self.response_cache[cache_key]
+                return cached_response
             
             # Check if query is college-related and RAG is available
-            if RAG_AVAILABLE and self._is_college_related(query):
-                print("Using RAG model for college-related query")
+            college_categories = self._college_categories(query) if RAG_AVAILABLE else []
+            if college_categories:
+                print(f"Using RAG model for college-related query ({', '.join(college_categories)})")
                 rag_result = query_rag_model(query)
                 
                 if "error" not in rag_result:
@@ -150,21 +215,19 @@ class LLMService:
                     
                     # Update conversation history and cache
                     self.conversation_history.append((query, model_response))
-                    self.response_cache[cache_key] = model_response
+                    self.response_cache.put(query, model_response)
                     return model_response
                 else:
                     print(f"RAG error: {rag_result.get('error')}. Falling back to default model.")
             
-            # Format conversation history for context
-            context = None
-            if self.conversation_history:
-                # Convert history tuples to token integers for context
-                context = [int(ord(c)) for pair in self.conversation_history[-MAX_HISTORY_LENGTH:] 
-                          for c in pair[0] + pair[1]]
-            
             # Select the appropriate model for this query
             selected_model = self._select_model_for_query(query)
             
+            # Continue from the context tokens Ollama returned for this session's last turn,
+            # so the model reuses its evaluated prompt instead of re-reading the history
+            context_key = (session_id, selected_model)
+            context = self.ollama_contexts[context_key][0] if context_key in self.ollama_contexts else None
+            
             # Format the query to ensure we get a proper response from the local model
             formatted_query = f"Please provide a direct and informative answer to this question: {query}"
             
@@ -186,6 +249,9 @@ class LLMService:
             # Process the response to ensure it's relevant and concise
             model_response = response['response'].strip()
             
+            # Keep the returned context for the next turn
+            self._store_context(context_key, response.get('context'))
+            
             # Update conversation history
             self.conversation_history.append((query, model_response))
             
@@ -193,12 +259,9 @@ class LLMService:
             if len(self.conversation_history) > MAX_HISTORY_LENGTH * 2:
                 self.conversation_history = self.conversation_history[-MAX_HISTORY_LENGTH * 2:]
             
-            # Cache the response
-            if len(self.response_cache) >= self.cache_size_limit:
-                # Remove oldest item if cache is full
-                oldest_key = next(iter(self.response_cache))
-                self.response_cache.pop(oldest_key)
-            self.response_cache[cache_key] = model_response
+            # Cache the response if it did not build on earlier turns
+            if context is None:
+                self.response_cache.put(query, model_response)
             
             return model_response
         
@@ -243,11 +306,21 @@ class LLMService:
         Clear conversation history.
         """
         self.conversation_history = []
+        self.ollama_contexts = OrderedDict()
         return True
         
     def clear_cache(self):
         """
         Clear response cache.
         """
-        self.response_cache = {}
-        return True
\ No newline at end of file
+        self.response_cache.clear()
+        return True
+    
+    def get_cache_stats(self):
+        """
+        Get response cache statistics.
+        
+        Returns:
+            dict: Entry count, memory use and hit/miss counters
+        """
+        return self.response_cache.stats()
\ No newline at end of file
@@ -5,20 +5,30 @@ Jarvis Voice Assistant - News Service Module
 This module handles interactions with news APIs.
 """
 
-import requests
-from config.settings import NEWS_API_KEY
+from config.settings import (
+    NEWS_API_KEY, NEWS_API_URL, HTTP_TIMEOUT, NEWS_CACHE_TTL, API_CACHE_STALE_TTL, API_CACHE_DIR
+)
+from services.http_client import get_session
+from utils.cache import ttl_cache, normalize_key, source_key
 
 class NewsService:
     """
     Provides news information using NewsAPI.
     """
     
-    def __init__(self):
+    def __init__(self, base_url=NEWS_API_URL, session=None):
         """
         Initialize the news service.
+        
+        Args:
+            base_url (str): Top headlines endpoint, e.g. a local stub server in tests
+            session (requests.Session, optional): HTTP session, the shared pooled one by default
         """
         self.api_key = NEWS_API_KEY
-        self.base_url = "https://newsapi.org/v2/top-headlines"
+        self.base_url = base_url
+        self.session = session or get_session()
+        # The cache is shared by all instances, results are kept apart per endpoint and key
+        self.cache_source = source_key(self.base_url, self.api_key)
     
     def get_headlines(self, country='us', category=None, max_results=3):
         """
@@ -33,30 +43,48 @@ class NewsService:
             str: News headlines as a formatted string
         """
         try:
-            params = {
-                'country': country,
-                'apiKey': self.api_key
-            }
-            
-            if category:
-                params['category'] = category
-            
-            response = requests.get(self.base_url, params=params)
-            data = response.json()
-            
-            if response.status_code != 200:
-                return f"Couldn't retrieve news: {data.get('message', 'Unknown error')}"
+            titles = self._fetch_headlines(country, category)[:max_results]
             
-            articles = data['articles'][:max_results]
-            
-            if not articles:
+            if not titles:
                 return "No news headlines available at the moment."
             
             headlines = "Here are today's top headlines. "
-            for i, article in enumerate(articles, 1):
-                headlines += f"{i}. {article['title']}. "
+            for i, title in enumerate(titles, 1):
+                headlines += f"{i}. {title}. "
             
             return headlines
         
         except Exception as e:
-            return f"Couldn't retrieve news: {str(e)}"
\ No newline at end of file
+            return f"Couldn't retrieve news: {str(e)}"
+    
+    @ttl_cache('news', NEWS_CACHE_TTL, key=lambda self, country, category: (self.cache_source,) + normalize_key(country, category),
+               stale_ttl=API_CACHE_STALE_TTL, disk_dir=API_CACHE_DIR)
+    def _fetch_headlines(self, country, category):
+        """
+        Fetch top headline titles, cached per endpoint, API key, normalized country and category.
+        
+        Args:
+            country (str): The country code to get news for
+            category (str): News category, or None for all categories
+            
+        Returns:
+            list: Headline titles
+            
+        Raises:
+            RuntimeError: If the API returns an error
+        """
+        params = {
+            'country': country,
+            'apiKey': self.api_key
+        }
+        
+        if category:
+            params['category'] = category
+        
+        response = self.session.get(self.base_url, params=params, timeout=HTTP_TIMEOUT)
+        data = response.json()
+        
+        if response.status_code != 200:
+            raise RuntimeError(data.get('message', 'Unknown error'))
+        
+        return [article['title'] for article in data['articles']]
@@ -5,20 +5,30 @@ Jarvis Voice Assistant - Weather Service Module
 This module handles interactions with weather APIs.
 """
 
-import requests
-from config.settings import WEATHER_API_KEY
+from config.settings import (
+    WEATHER_API_KEY, WEATHER_API_URL, HTTP_TIMEOUT, WEATHER_CACHE_TTL, API_CACHE_STALE_TTL, API_CACHE_DIR
+)
+from services.http_client import get_session
+from utils.cache import ttl_cache, normalize_key, source_key
 
 class WeatherService:
     """
     Provides weather information using OpenWeatherMap API.
     """
     
-    def __init__(self):
+    def __init__(self, base_url=WEATHER_API_URL, session=None):
         """
         Initialize the weather service.
+        
+        Args:
+            base_url (str): Current weather endpoint, e.g. a local stub server in tests
+            session (requests.Session, optional): HTTP session, the shared pooled one by default
         """
         self.api_key = WEATHER_API_KEY
-        self.base_url = "http://api.openweathermap.org/data/2.5/weather"
+        self.base_url = base_url
+        self.session = session or get_session()
+        # The cache is shared by all instances, results are kept apart per endpoint and key
+        self.cache_source = source_key(self.base_url, self.api_key)
     
     def get_weather(self, city):
         """
@@ -31,24 +41,43 @@ class WeatherService:
             str: Weather information as a formatted string
         """
         try:
-            params = {
-                'q': city,
-                'appid': self.api_key,
-                'units': 'metric'
-            }
-            
-            response = requests.get(self.base_url, params=params)
-            data = response.json()
-            
-            if response.status_code != 200:
-                return f"Couldn't retrieve weather: {data.get('message', 'Unknown error')}"
+            data = self._fetch_weather(city)
+            return (f"Weather in {city}: {data['description']}, Temperature: {data['temp']}°C, "
+                    f"Feels like: {data['feels_like']}°C, Humidity: {data['humidity']}%")
+        
+        except Exception as e:
+            return f"Couldn't retrieve weather: {str(e)}"
+    
+    @ttl_cache('weather', WEATHER_CACHE_TTL, key=lambda self, city: (self.cache_source,) + normalize_key(city),
+               stale_ttl=API_CACHE_STALE_TTL, disk_dir=API_CACHE_DIR)
+    def _fetch_weather(self, city):
+        """
+        Fetch current weather for a city, cached per endpoint, API key and normalized city name.
+        
+        Args:
+            city (str): The city to get weather for
             
-            weather = data['weather'][0]['description']
-            temp = data['main']['temp']
-            feels_like = data['main']['feels_like']
-            humidity = data['main']['humidity']
+        Returns:
+            dict: Weather description, temperature, feels-like temperature and humidity
             
-            return f"Weather in {city}: {weather}, Temperature: {temp}°C, Feels like: {feels_like}°C, Humidity: {humidity}%"
+        Raises:
+            RuntimeError: If the API returns an error
+        """
+        params = {
+            'q': city,
+            'appid': self.api_key,
+            'units': 'metric'
+        }
         
-        except Exception as e:
-            return f"Couldn't retrieve weather: {str(e)}"
\ No newline at end of file
+        response = self.session.get(self.base_url, params=params, timeout=HTTP_TIMEOUT)
+        data = response.json()
+        
+        if response.status_code != 200:
+            raise RuntimeError(data.get('message', 'Unknown error'))
+        
+        return {
+            'description': data['weather'][0]['description'],
+            'temp': data['main']['temp'],
+            'feels_like': data['main']['feels_like'],
+            'humidity': data['main']['humidity']
+        }
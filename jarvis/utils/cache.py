@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Jarvis Voice Assistant - Cache Utilities
+
+This module contains caches shared by the assistant's services.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import time
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Response cache that matches paraphrased queries by embedding similarity.
+
+    Entries are evicted least-recently-used once the entry or memory limit is
+    reached, and expire after a fixed time to live. Without an embedding
+    function the cache falls back to matching normalized query text.
+    """
+
+    def __init__(self, embed=None, max_entries=200, ttl=3600, similarity_threshold=0.92,
+                 max_bytes=8 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            embed (callable, optional): Function mapping a query to an embedding vector
+            max_entries (int): Maximum number of cached responses
+            ttl (int): Seconds before a cached response expires
+            similarity_threshold (float): Minimum cosine similarity for a semantic hit
+            max_bytes (int): Approximate memory limit for cached responses and embeddings
+        """
+        self.embed = embed
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()  # normalized query -> (response, embedding, created, size)
+        self._lock = threading.Lock()
+        self._matrix = None  # stacked embeddings, rebuilt lazily after changes
+        self._matrix_keys = []
+        self._last_embedding = (None, None)
+        self._bytes = 0
+
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(query):
+        """
+        Normalize a query so trivial differences in case, punctuation and spacing match.
+
+        Args:
+            query (str): The query to normalize
+
+        Returns:
+            str: The normalized query
+        """
+        query = re.sub(r"[^\w\s']", " ", query.lower())
+        return " ".join(query.split())
+
+    def _embed(self, key):
+        """
+        Embed a normalized query as a unit vector, reusing the last result.
+
+        Returns:
+            numpy.ndarray or None: The embedding, or None if unavailable
+        """
+        if self.embed is None:
+            return None
+        if self._last_embedding[0] == key:
+            return self._last_embedding[1]
+
+        try:
+            vector = np.asarray(self.embed(key), dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector = vector / norm
+        except Exception as e:
+            print(f"Error embedding query for cache: {e}")
+            return None
+
+        self._last_embedding = (key, vector)
+        return vector
+
+    def _remove(self, key):
+        """Remove an entry; the caller must hold the lock."""
+        _, _, _, size = self._entries.pop(key)
+        self._bytes -= size
+        self._matrix = None
+
+    def _expire(self, now):
+        """Drop expired entries; the caller must hold the lock."""
+        expired = [key for key, entry in self._entries.items() if now - entry[2] > self.ttl]
+        for key in expired:
+            self._remove(key)
+            self.evictions += 1
+
+    def _nearest(self, vector):
+        """
+        Find the cached query most similar to the given embedding.
+
+        Returns:
+            tuple: (key, similarity) or (None, 0.0) if nothing is cached
+        """
+        if self._matrix is None:
+            self._matrix_keys = [key for key, entry in self._entries.items() if entry[1] is not None]
+            self._matrix = (
+                np.vstack([self._entries[key][1] for key in self._matrix_keys])
+                if self._matrix_keys else np.empty((0, 0), dtype=np.float32)
+            )
+        if not self._matrix_keys:
+            return None, 0.0
+
+        similarities = self._matrix @ vector
+        best = int(np.argmax(similarities))
+        return self._matrix_keys[best], float(similarities[best])
+
+    def get(self, query):
+        """
+        Look up a cached response for a query or a paraphrase of it.
+
+        Args:
+            query (str): The user's query
+
+        Returns:
+            str or None: The cached response, or None on a miss
+        """
+        key = self.normalize(query)
+        with self._lock:
+            self._expire(time.time())
+
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        # Embed outside the lock, it is the slow part of a lookup
+        vector = self._embed(key)
+
+        with self._lock:
+            if vector is not None:
+                match, similarity = self._nearest(vector)
+                if match is not None and similarity >= self.similarity_threshold:
+                    self._entries.move_to_end(match)
+                    self.hits += 1
+                    self.semantic_hits += 1
+                    return self._entries[match][0]
+
+            self.misses += 1
+            return None
+
+    def put(self, query, response):
+        """
+        Cache a response for a query.
+
+        Args:
+            query (str): The user's query
+            response (str): The response to cache
+        """
+        key = self.normalize(query)
+        vector = self._embed(key)
+        size = sys.getsizeof(response) + (vector.nbytes if vector is not None else 0)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            # Evict least recently used entries until the new one fits
+            while self._entries and (len(self._entries) >= self.max_entries or
+                                     self._bytes + size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            self._entries[key] = (response, vector, time.time(), size)
+            self._bytes += size
+            self._matrix = None
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._matrix = None
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Entry count, memory use and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+
+def normalize_key(*parts):
+    """
+    Build a cache key that ignores case and spacing differences.
+
+    Args:
+        *parts: Key components such as a city, country or category; None is kept as ''
+
+    Returns:
+        tuple: The normalized key
+    """
+    return tuple(" ".join(str(part).lower().split()) if part is not None else "" for part in parts)
+
+
+def source_key(*parts):
+    """
+    Identify the source of cached results, e.g. an endpoint and its API key.
+
+    Args:
+        *parts: Values that change what the source returns; None is kept as ''
+
+    Returns:
+        str: A short hash of the parts, so secrets are not written to the disk tier
+    """
+    joined = "\0".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:16]
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries are fresh for a time to live and
+    may then be served stale for a grace period while they are refreshed.
+
+    With a disk directory, entries are also kept in a JSON file so they
+    survive restarts. Values must then be JSON serializable.
+    """
+
+    def __init__(self, name, ttl, stale_ttl=0, max_entries=256, disk_dir=None):
+        """
+        Initialize the cache.
+
+        Args:
+            name (str): Cache name, also the disk file name
+            ttl (int): Seconds an entry is fresh
+            stale_ttl (int): Further seconds an expired entry may be served while refreshing
+            max_entries (int): Maximum number of entries
+            disk_dir (str, optional): Directory of the on-disk tier, disabled if None
+        """
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.disk_path = os.path.join(disk_dir, f"{name}.json") if disk_dir else None
+
+        self._entries = OrderedDict()  # key -> (value, created)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        """Read the on-disk tier, dropping entries too old to serve."""
+        if not self.disk_path:
+            return
+        try:
+            with open(self.disk_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        for key, (value, created) in sorted(stored.items(), key=lambda item: item[1][1]):
+            if now - created <= self.ttl + self.stale_ttl:
+                self._entries[tuple(json.loads(key))] = (value, created)
+
+    def _save(self):
+        """Write the entries to the on-disk tier atomically; the caller must hold the lock."""
+        if not self.disk_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.disk_path), exist_ok=True)
+            temp_path = self.disk_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({json.dumps(list(key)): entry for key, entry in self._entries.items()}, f)
+            os.replace(temp_path, self.disk_path)
+        except (OSError, TypeError) as e:
+            print(f"Error saving {self.name} cache: {e}")
+
+    def lookup(self, key):
+        """
+        Look up a key.
+
+        Args:
+            key (tuple): The cache key
+
+        Returns:
+            tuple: (value, state) where state is 'fresh', 'stale' or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.time() - entry[1]
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0], "fresh"
+                if age <= self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    return entry[0], "stale"
+                del self._entries[key]
+            self.misses += 1
+            return None, None
+
+    def put(self, key, value):
+        """
+        Cache a value.
+
+        Args:
+            key (tuple): The cache key
+            value: The value to cache
+        """
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def clear(self):
+        """Remove all cached values."""
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Entry count and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def ttl_cache(name, ttl, key, stale_ttl=0, max_entries=256, disk_dir=None):
+    """
+    Cache a function's results for a time to live.
+
+    Fresh results are returned from the cache. An expired result within the
+    stale period is returned immediately while one background call refreshes
+    it (stale-while-revalidate). Calls that raise are not cached, and a failed
+    refresh keeps serving the stale result until the stale period ends.
+
+    Args:
+        name (str): Cache name, also the disk file name
+        ttl (int): Seconds a result is fresh
+        key (callable): Maps the call's arguments to a hashable key, see normalize_key
+        stale_ttl (int): Further seconds an expired result may be served while refreshing
+        max_entries (int): Maximum number of cached results
+        disk_dir (str, optional): Directory of the on-disk tier, disabled if None
+
+    Returns:
+        callable: The decorator; the wrapped function exposes its TTLCache as .cache
+    """
+    def decorator(func):
+        cache = TTLCache(name, ttl, stale_ttl, max_entries, disk_dir)
+        refreshing = set()
+        refreshing_lock = threading.Lock()
+
+        def refresh(cache_key, args, kwargs):
+            try:
+                cache.put(cache_key, func(*args, **kwargs))
+            except Exception as e:
+                print(f"Error refreshing {name} cache: {e}")
+            finally:
+                with refreshing_lock:
+                    refreshing.discard(cache_key)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            value, state = cache.lookup(cache_key)
+            if state == "fresh":
+                return value
+            if state == "stale":
+                with refreshing_lock:
+                    start = cache_key not in refreshing
+                    refreshing.add(cache_key)
+                if start:
+                    threading.Thread(target=refresh, args=(cache_key, args, kwargs), daemon=True).start()
+                return value
+
+            value = func(*args, **kwargs)
+            cache.put(cache_key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
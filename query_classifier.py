@@ -0,0 +1,53 @@
+"""
+Query Classifier - Detect college and admissions topics in user queries
+
+All college keywords are compiled into one regular expression with a named
+group per category, so a query is classified in a single scan. Used by the
+Jarvis LLM service to route queries to RAG and by the RAG assistant's query
+preprocessing.
+"""
+import re
+from typing import List
+
+# Keyword patterns per category, matched as whole words
+COLLEGE_CATEGORIES = {
+    "institution": [r"college", r"university", r"campus", r"school"],
+    "admissions": [r"admissions?", r"apply", r"application", r"enroll(?:ment)?", r"deadline",
+                   r"requirements?"],
+    "finance": [r"fees?", r"tuition", r"scholarship", r"financial aid"],
+    "academics": [r"courses?", r"programs?", r"majors?", r"degrees?", r"faculty", r"professors?",
+                  r"class(?:es)?", r"semester", r"quarter", r"academic", r"study"],
+    "housing": [r"dorm", r"housing"],
+    "students": [r"students?"],
+    "testing": [r"tests?", r"exams?", r"sat", r"act", r"gpa", r"grades?"],
+}
+
+# Base keywords, used as the vocabulary for query spelling correction
+COLLEGE_KEYWORDS = [
+    "college", "university", "campus", "school", "admission", "apply", "application",
+    "fee", "tuition", "scholarship", "financial", "enroll", "course", "program",
+    "major", "degree", "dorm", "housing", "student", "faculty", "professor", "class",
+    "semester", "quarter", "academic", "study", "deadline", "requirement",
+    "test", "exam", "sat", "act", "gpa", "grade", "transcript", "essay"
+]
+
+COLLEGE_PATTERN = re.compile(
+    r"\b(?:" + "|".join(
+        f"(?P<{category}>{'|'.join(patterns)})" for category, patterns in COLLEGE_CATEGORIES.items()
+    ) + r")\b",
+    re.IGNORECASE
+)
+
+
+def is_college_related(query: str) -> bool:
+    """Whether the query mentions any college-related keyword"""
+    return COLLEGE_PATTERN.search(query) is not None
+
+
+def match_college_categories(query: str) -> List[str]:
+    """Categories of the college-related keywords in the query, in order of first mention"""
+    categories = []
+    for match in COLLEGE_PATTERN.finditer(query):
+        if match.lastgroup not in categories:
+            categories.append(match.lastgroup)
+    return categories
@@ -1,155 +1,202 @@
 import os
 import sys
+import json
+import time
+import shutil
+import logging
+from collections import Counter
 from langchain.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import Chroma
-from langchain.document_loaders import JSONLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.chains import RetrievalQA
-from langchain.llms import Ollama
+from query_classifier import COLLEGE_KEYWORDS
+from rag_dataset import (
+    DATASET_FILE, FALLBACK_DATASET_FILE, find_dataset_file, iter_records, record_text, record_metadata,
+    record_hash, file_hash, build_vocabulary
+)
+from rag_engine import INDEX_DIR, EMBEDDING_MODEL, LLM_MODEL, VECTOR_BACKEND, open_vector_store, get_rag_engine
+from spell_correction import SpellCorrector, load_dictionary
+
+logger = logging.getLogger("rag-assistant")
+
+# Manifest kept inside the index directory, mapping record content hashes to chunk ids
+MANIFEST_FILE = "manifest.json"
+
+# Version of the chunk metadata written by chunk_record; indexes with another version are rebuilt
+CHUNK_SCHEMA = 2
+
+# Query spell corrector, built from the dataset vocabulary on first use
+_spell_corrector = None
+
+def manifest_path():
+    """Path of the manifest tracking which dataset records are in the index"""
+    return os.path.join(INDEX_DIR, MANIFEST_FILE)
+
+def load_manifest():
+    """Load the index manifest, or None if the index has none"""
+    try:
+        with open(manifest_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_manifest(manifest):
+    """Write the index manifest atomically"""
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    temp_path = manifest_path() + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, manifest_path())
+
+def chunk_record(record, record_id, splitter):
+    """Split a record into chunk texts, metadata and stable chunk ids"""
+    metadata = record_metadata(record)
+    chunk_metadata = {
+        # Chroma metadata values must be scalars
+        "keywords": ", ".join(metadata["keywords"]),
+        "category": metadata["category"],
+        "record_id": record_id
+    }
+    texts = splitter.split_text(record_text(record))
+    # Extractive answers are only taken from records held in a single chunk
+    chunk_metadata["chunks"] = len(texts)
+    ids = [f"{record_id}-{i}" for i in range(len(texts))]
+    return texts, [dict(chunk_metadata) for _ in texts], ids
 
 def setup_vector_db():
-    """Load JSONL data, create embeddings and store in ChromaDB"""
-    # Check if vector DB already exists
-    if os.path.exists("college_faq_index") and os.path.isdir("college_faq_index"):
-        print("Vector database already exists. Loading existing database...")
-        return True
-        
-    # Check if data file exists - prioritize college_admissions_dataset.jsonl in root directory
-    data_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "college_admissions_dataset.jsonl")
-    if not os.path.exists(data_file):
-        # Try to use college_faq.jsonl as fallback
-        fallback_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "college_faq.jsonl")
-        if os.path.exists(fallback_file):
-            data_file = fallback_file
-            print(f"Using fallback dataset: {data_file}")
-        else:
-            print(f"Error: Missing dataset file {data_file}")
-            return False
+    """Bring the vector index up to date with the JSONL dataset, embedding only changed records"""
+    data_file = find_dataset_file()
+    if data_file is None:
+        print(f"Error: Missing dataset file {DATASET_FILE}")
+        return False
     
     try:
+        manifest = load_manifest()
+        dataset_version = file_hash(data_file)
+        
+        # An index written by another vector backend is not readable by this one
+        if manifest and manifest.get("vector_backend", "chroma") != VECTOR_BACKEND:
+            manifest = None
+        
+        # An index ingested from another file, e.g. a large corpus with rag_ingest,
+        # is not this dataset's to update or prune
+        own_files = {os.path.basename(DATASET_FILE), os.path.basename(FALLBACK_DATASET_FILE)}
+        if (manifest and manifest.get("embedding_model") == EMBEDDING_MODEL and
+                manifest.get("dataset_file", os.path.basename(data_file)) not in own_files):
+            print(f"Vector database was built from {manifest['dataset_file']}, leaving it as is...")
+            return True
+        
+        # Unchanged dataset: nothing to embed
+        if (manifest and manifest.get("dataset_version") == dataset_version and
+                manifest.get("chunk_schema") == CHUNK_SCHEMA and os.path.isdir(INDEX_DIR)):
+            print("Vector database is up to date. Loading existing database...")
+            return True
+        
+        # An index without a manifest, built with another embedding model or with older
+        # chunk metadata cannot be updated incrementally, so rebuild it
+        if os.path.isdir(INDEX_DIR) and (manifest is None or manifest.get("embedding_model") != EMBEDDING_MODEL or
+                                         manifest.get("chunk_schema") != CHUNK_SCHEMA):
+            print("Existing vector database cannot be updated incrementally, rebuilding it...")
+            get_rag_engine().close()
+            shutil.rmtree(INDEX_DIR)
+            manifest = None
+        
+        indexed = manifest["records"] if manifest else {}
+        
         print(f"Loading data from {data_file}...")
-        # Load JSONL data
-        loader = JSONLoader(
-            file_path=data_file, 
-            jq_schema='.', 
-            content_key='text', # Changed from 'response' to 'text'
-            metadata_func=lambda x: {"keywords": x.get("metadata", {}).get("keywords", []), "category": x.get("metadata", {}).get("category", "")}, # Extract metadata
-            text_content=True # Ensure text content is loaded
-        )
-        docs = loader.load()
-        print(f"Loaded {len(docs)} documents")
+        current = {}
+        for record in iter_records(data_file):
+            current.setdefault(record_hash(record), record)
         
-        # Split docs
-        print("Splitting documents into chunks...")
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-        chunks = splitter.split_documents(docs)
-        print(f"Created {len(chunks)} chunks")
+        added = [record_id for record_id in current if record_id not in indexed]
+        removed = [record_id for record_id in indexed if record_id not in current]
+        print(f"{len(current)} records: {len(added)} new or changed, {len(removed)} removed")
         
-        # Add debug output to verify document content
-        if chunks:
-            print(f"Sample chunk content: {chunks[0].page_content[:100]}...")
-            print(f"Sample chunk metadata: {chunks[0].metadata}")
+        if added or removed:
+            embedding = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+            db = open_vector_store(embedding)
+            
+            # Delete chunks of removed and changed records
+            stale_ids = [chunk_id for record_id in removed for chunk_id in indexed[record_id]]
+            if stale_ids:
+                db.delete(ids=stale_ids)
+            
+            # Embed and upsert chunks of new and changed records
+            splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+            texts, metadatas, ids = [], [], []
+            records = dict(indexed)
+            for record_id in removed:
+                del records[record_id]
+            for record_id in added:
+                record_texts, record_metadatas, record_ids = chunk_record(current[record_id], record_id, splitter)
+                texts.extend(record_texts)
+                metadatas.extend(record_metadatas)
+                ids.extend(record_ids)
+                records[record_id] = record_ids
+            
+            if texts:
+                print(f"Creating embeddings for {len(texts)} chunks...")
+                db.add_texts(texts, metadatas=metadatas, ids=ids)
+            db.persist()
+        else:
+            records = indexed
+        
+        save_manifest({
+            "dataset_file": os.path.basename(data_file),
+            "dataset_version": dataset_version,
+            "embedding_model": EMBEDDING_MODEL,
+            "vector_backend": VECTOR_BACKEND,
+            "chunk_schema": CHUNK_SCHEMA,
+            "updated": time.time(),
+            "records": records
+        })
+        print("Vector database updated and persisted successfully")
         
-        # Embed and store
-        print("Creating embeddings and storing in vector database...")
-        embedding = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-        db = Chroma.from_documents(chunks, embedding, persist_directory="college_faq_index")
-        db.persist()
-        print("Vector database created and persisted successfully")
+        # Make a running engine pick up the changed index
+        engine = get_rag_engine()
+        if engine.loaded and (added or removed):
+            engine.reload()
         return True
         
     except Exception as e:
         print(f"Error setting up vector database: {str(e)}")
         return False
 
-def preprocess_query(query_text):
-    """Preprocess the query to handle typos and partial keyword matches"""
-    # List of common college-related keywords
-    college_keywords = [
-        "college", "university", "campus", "school", "admission", "apply", "application",
-        "fee", "tuition", "scholarship", "financial", "enroll", "course", "program",
-        "major", "degree", "dorm", "housing", "student", "faculty", "professor", "class",
-        "semester", "quarter", "academic", "study", "deadline", "requirement",
-        "test", "exam", "sat", "act", "gpa", "grade", "transcript", "essay"
-    ]
+def get_spell_corrector():
+    """
+    Build the query spell corrector on first use.
     
-    # Check for fuzzy matches with college keywords
-    words = query_text.lower().split()
-    for i, word in enumerate(words):
-        # Skip very short words (less than 3 chars)
-        if len(word) < 3:
-            continue
-            
-        for keyword in college_keywords:
-            # Skip keywords that are too different in length
-            if abs(len(word) - len(keyword)) > 3:
-                continue
-                
-            # Check for partial match (word contains keyword or keyword contains word)
-            if word in keyword or keyword in word:
-                print(f"Partial keyword match: '{word}' matches '{keyword}'")
-                words[i] = keyword  # Replace with correct keyword
-                break
-                
-            # Simple character-based similarity (at least 70% of chars match)
-            common_chars = sum(c in keyword for c in word)
-            if common_chars >= 0.7 * len(word):
-                print(f"Fuzzy keyword match: '{word}' corrected to '{keyword}'")
-                words[i] = keyword  # Replace with correct keyword
-                break
+    The dataset is too small to stand for English, so words are only corrected
+    towards the college keywords, and words in the dataset or the system
+    dictionary are never changed.
+    """
+    global _spell_corrector
+    if _spell_corrector is None:
+        vocabulary = Counter()
+        data_file = find_dataset_file()
+        if data_file:
+            vocabulary = build_vocabulary(data_file)
+        for keyword in COLLEGE_KEYWORDS:
+            vocabulary[keyword] += 100
+        _spell_corrector = SpellCorrector(vocabulary, targets=COLLEGE_KEYWORDS, dictionary=load_dictionary())
+    return _spell_corrector
+
+def preprocess_query(query_text):
+    """Correct typos of college keywords in the query, for retrieval"""
+    query_lower = query_text.lower()
+    processed_query = get_spell_corrector().correct(query_lower)
     
-    # Reconstruct the query with corrected words
-    processed_query = " ".join(words)
-    if processed_query != query_text.lower():
-        print(f"Original query: '{query_text}'")
-        print(f"Processed query: '{processed_query}'")
+    if processed_query != query_lower:
+        logger.debug(f"Processed query: '{query_text}' -> '{processed_query}'")
     
     return processed_query
 
 def query_rag_model(query_text):
     """Query the RAG model with the given text"""
     try:
-        # Preprocess query to handle typos and partial matches
+        # Retrieve with typos corrected, but answer the question as the user asked it
         processed_query = preprocess_query(query_text)
         
-        # Load embedding model
-        embedding = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-        
-        # Load DB
-        db = Chroma(persist_directory="college_faq_index", embedding_function=embedding)
-        
-        # Init LLM (Gemma 2B running via Ollama)
-        llm = Ollama(model="gemma:2b")
-        
-        # Create QA chain with improved retrieval parameters
-        retriever = db.as_retriever(
-            search_type="similarity",
-            search_kwargs={
-                "k": 5,  # Retrieve more documents for better context
-                "score_threshold": 0.5  # Only include relevant matches
-            }
-        )
-        
-        qa_chain = RetrievalQA.from_chain_type(
-            llm=llm,
-            retriever=retriever,
-            return_source_documents=True,
-            chain_type_kwargs={
-                "prompt": f"Based on the following context, answer the question. If the answer is not in the context, say 'I don't have information about that in my knowledge base.'\n\nContext: {{context}}\n\nQuestion: {{question}}\n\nAnswer:"
-            }
-        )
-        
-        # Run query with the processed query text
-        result = qa_chain({"query": processed_query})
-        
-        # Return formatted result
-        answer = result["result"]
-        sources = [doc.page_content for doc in result["source_documents"]]
-        
-        return {
-            "answer": answer,
-            "sources": sources
-        }
+        # Run query on the shared engine, which keeps the embedder, DB and chain loaded
+        return get_rag_engine().query(query_text, retrieval_query=processed_query)
         
     except Exception as e:
         print(f"Error querying RAG model: {str(e)}")
@@ -204,18 +251,21 @@ def main():
             print("Error: Ollama server not running. Please start Ollama first.")
             return
             
-        # Check if gemma:2b model is available
+        # Check if the RAG model is available
         models = response.json().get("models", [])
         model_names = [model.get("name") for model in models]
-        if "gemma:2b" not in model_names:
-            print("Warning: gemma:2b model not found in Ollama.")
-            print("Please run: ollama pull gemma:2b")
+        if LLM_MODEL not in model_names:
+            print(f"Warning: {LLM_MODEL} model not found in Ollama.")
+            print(f"Please run: ollama pull {LLM_MODEL}")
             return
     except Exception as e:
         print(f"Error checking Ollama: {str(e)}")
         print("Please ensure Ollama is running with: ollama serve")
         return
     
+    # Load models once before the first question
+    get_rag_engine().warm_up()
+    
     # Start interactive mode
     interactive_mode()
 
@@ -0,0 +1,290 @@
+"""
+RAG Benchmark - Retrieval quality and latency regression suite
+
+Builds a throwaway index from the dataset with the given chunking and vector
+backend, generates question / gold-answer pairs from the records and runs
+them through a RagEngine whose LLM is stubbed, so the suite runs offline and
+measures only our own code. Each record yields its own question plus one
+paraphrase per metadata keyword.
+
+Reports retrieval recall@k and MRR against the gold record, extractive answer
+accuracy, and embed / search / generate latency percentiles, and writes them
+to a JSON report that can be compared against an earlier run.
+
+Usage:
+    python rag_benchmark.py [--k N] [--backend chroma|flat|flat-int8] [--baseline OLD.json]
+"""
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+from typing import Any, Dict, List, Optional
+
+from langchain.llms.base import LLM
+
+from rag_dataset import find_dataset_file, iter_records, record_hash
+from rag_engine import (
+    EMBEDDING_MODEL, RETRIEVER_K, VECTOR_BACKEND, VECTOR_BACKENDS, HYBRID_RETRIEVAL,
+    EXTRACTIVE_ANSWERS, RagEngine, extract_answer, open_vector_store
+)
+from embedding_cache import QueryEmbeddingCache, normalize_query
+
+QUESTION_PATTERN = re.compile(r"\bQ:\s*(.+?)\s*\bA:", re.DOTALL)
+
+# Metrics compared against a baseline report: (path, higher is better)
+COMPARED_METRICS = [
+    (("retrieval", "recall_at_k"), True),
+    (("retrieval", "mrr"), True),
+    (("answers", "extractive_accuracy"), True),
+    (("latency_ms", "embed", "p50"), False),
+    (("latency_ms", "search", "p50"), False),
+    (("latency_ms", "search", "p95"), False),
+    (("latency_ms", "generate", "p50"), False),
+]
+
+
+class StubLLM(LLM):
+    """Offline stand-in for the Ollama model with a fixed answer and optional delay"""
+
+    latency: float = 0.0
+    response: str = "Stub answer."
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.response
+
+
+def generate_cases(data_file: str, keyword_questions: bool = True) -> List[Dict[str, Any]]:
+    """Question / gold-answer pairs from the dataset's Q/A records, one per distinct question"""
+    cases, seen = [], set()
+
+    def add(question, record_id, answer, kind):
+        key = normalize_query(question)
+        if key and key not in seen:
+            seen.add(key)
+            cases.append({"question": question, "record_id": record_id, "answer": answer, "kind": kind})
+
+    for record in iter_records(data_file):
+        text = record.get("text", "")
+        match = QUESTION_PATTERN.search(text)
+        if match is None:
+            continue
+        record_id = record_hash(record)
+        answer = extract_answer(text)
+        add(match.group(1), record_id, answer, "question")
+        if keyword_questions:
+            for keyword in record.get("metadata", {}).get("keywords", []):
+                add(f"What about {keyword}?", record_id, answer, "keyword")
+    return cases
+
+
+def build_index(data_file: str, index_dir: str, backend: str, chunk_size: int, chunk_overlap: int) -> int:
+    """Index the whole dataset into index_dir, returning the number of chunks"""
+    from langchain.embeddings import HuggingFaceEmbeddings
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from rag_assistant import chunk_record
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    texts, metadatas, ids = [], [], []
+    for record in iter_records(data_file):
+        record_texts, record_metadatas, record_ids = chunk_record(record, record_hash(record), splitter)
+        texts.extend(record_texts)
+        metadatas.extend(record_metadatas)
+        ids.extend(record_ids)
+
+    db = open_vector_store(HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL), index_dir, backend)
+    db.add_texts(texts, metadatas=metadatas, ids=ids)
+    db.persist()
+    return len(texts)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Mean and nearest-rank percentiles of latency samples in seconds, as milliseconds"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))] * 1000
+
+    return {
+        "mean": sum(ordered) / len(ordered) * 1000,
+        "p50": rank(50),
+        "p90": rank(90),
+        "p95": rank(95),
+        "p99": rank(99),
+        "max": ordered[-1] * 1000
+    }
+
+
+def run_benchmark(data_file: str, k: int = RETRIEVER_K, backend: str = VECTOR_BACKEND,
+                  chunk_size: int = 1000, chunk_overlap: int = 200, hybrid: bool = HYBRID_RETRIEVAL,
+                  extractive: bool = EXTRACTIVE_ANSWERS, llm_latency: float = 0.0,
+                  keyword_questions: bool = True) -> Dict[str, Any]:
+    """Build a temporary index, run every generated case and return the report"""
+    cases = generate_cases(data_file, keyword_questions)
+    index_dir = tempfile.mkdtemp(prefix="rag-benchmark-")
+    try:
+        start_time = time.perf_counter()
+        chunks = build_index(data_file, index_dir, backend, chunk_size, chunk_overlap)
+        build_seconds = time.perf_counter() - start_time
+
+        engine = RagEngine(index_dir=index_dir, k=k, hybrid=hybrid, extractive=extractive,
+                           vector_backend=backend, llm=StubLLM(latency=llm_latency))
+        # Private, memory-only cache: each question is embedded once, timed as "embed",
+        # and retrieval then reuses the vector so "search" excludes embedding
+        engine.query_cache.close()
+        engine.query_cache = QueryEmbeddingCache(EMBEDDING_MODEL, len(cases) + 1)
+        engine.warm_up()
+
+        latencies = {"embed": [], "search": [], "generate": []}
+        hits_at_k, reciprocal_ranks = 0, []
+        modes = {"extractive": 0, "generated": 0}
+        extractive_correct = 0
+        failures = []
+
+        for case in cases:
+            question = case["question"]
+
+            started = time.perf_counter()
+            engine.embed_query(question)
+            latencies["embed"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            hits = engine.retrieve(question)
+            latencies["search"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            result = engine.answer(question, hits)
+            latencies["generate"].append(time.perf_counter() - started)
+
+            ranked = [doc.metadata.get("record_id") for doc, _ in hits]
+            rank = ranked.index(case["record_id"]) + 1 if case["record_id"] in ranked else None
+            if rank is not None:
+                hits_at_k += 1
+            else:
+                failures.append({"question": question, "kind": case["kind"], "retrieved": ranked})
+            reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+            modes[result["mode"]] += 1
+            if result["mode"] == "extractive" and result["answer"] == case["answer"]:
+                extractive_correct += 1
+
+        engine.close()
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+    count = len(cases)
+    return {
+        "created": time.time(),
+        "config": {
+            "dataset_file": os.path.basename(data_file),
+            "embedding_model": EMBEDDING_MODEL,
+            "vector_backend": backend,
+            "k": k,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "hybrid": hybrid,
+            "extractive": extractive,
+            "llm_latency_ms": llm_latency * 1000
+        },
+        "index": {"chunks": chunks, "build_seconds": build_seconds},
+        "cases": {
+            "total": count,
+            "questions": sum(1 for case in cases if case["kind"] == "question"),
+            "keywords": sum(1 for case in cases if case["kind"] == "keyword")
+        },
+        "retrieval": {
+            "recall_at_k": hits_at_k / count if count else 0.0,
+            "mrr": sum(reciprocal_ranks) / count if count else 0.0,
+            "misses": failures
+        },
+        "answers": {
+            "modes": modes,
+            "extractive_accuracy": extractive_correct / modes["extractive"] if modes["extractive"] else 0.0
+        },
+        "latency_ms": {phase: percentiles(samples) for phase, samples in latencies.items()}
+    }
+
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Lines describing how the compared metrics moved since the baseline"""
+    lines = []
+    for path, higher_is_better in COMPARED_METRICS:
+        current, previous = report, baseline
+        for key in path:
+            current = current.get(key, {}) if isinstance(current, dict) else {}
+            previous = previous.get(key, {}) if isinstance(previous, dict) else {}
+        if not isinstance(current, (int, float)) or not isinstance(previous, (int, float)):
+            continue
+        delta = current - previous
+        improved = delta > 0 if higher_is_better else delta < 0
+        marker = "better" if improved else ("same" if delta == 0 else "WORSE")
+        lines.append(f"{'.'.join(path)}: {previous:.4f} -> {current:.4f} ({delta:+.4f}, {marker})")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RAG retrieval quality and latency")
+    parser.add_argument("--input", default=find_dataset_file(), help="JSONL dataset to benchmark on")
+    parser.add_argument("--k", type=int, default=RETRIEVER_K, help="Chunks retrieved per query")
+    parser.add_argument("--backend", choices=VECTOR_BACKENDS, default=VECTOR_BACKEND, help="Vector store backend")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Maximum characters per chunk")
+    parser.add_argument("--chunk-overlap", type=int, default=200, help="Characters shared by adjacent chunks")
+    parser.add_argument("--no-hybrid", action="store_true", help="Use vector search only")
+    parser.add_argument("--no-extractive", action="store_true", help="Always call the (stub) LLM")
+    parser.add_argument("--no-keyword-questions", action="store_true", help="Only use each record's own question")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated LLM latency")
+    parser.add_argument("--output", default="rag_benchmark_report.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    args = parser.parse_args()
+
+    if not args.input or not os.path.exists(args.input):
+        print(f"Error: Missing dataset file {args.input}")
+        sys.exit(1)
+
+    report = run_benchmark(
+        args.input,
+        k=args.k,
+        backend=args.backend,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        hybrid=not args.no_hybrid,
+        extractive=not args.no_extractive,
+        llm_latency=args.llm_latency_ms / 1000,
+        keyword_questions=not args.no_keyword_questions
+    )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    latency = report["latency_ms"]
+    print(f"{report['cases']['total']} cases, {report['index']['chunks']} chunks "
+          f"({report['config']['vector_backend']}, k={report['config']['k']})")
+    print(f"recall@{args.k}: {report['retrieval']['recall_at_k']:.3f}  MRR: {report['retrieval']['mrr']:.3f}  "
+          f"extractive accuracy: {report['answers']['extractive_accuracy']:.3f}")
+    for phase in ("embed", "search", "generate"):
+        if latency[phase]:
+            print(f"{phase:>8}: p50 {latency[phase]['p50']:.1f} ms  p95 {latency[phase]['p95']:.1f} ms  "
+                  f"p99 {latency[phase]['p99']:.1f} ms")
+    print(f"Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared to {args.baseline}:")
+        for line in compare_reports(report, baseline):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
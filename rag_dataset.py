@@ -0,0 +1,94 @@
+"""
+RAG Dataset - Locate and read the college admissions knowledge base
+
+Records are read lazily one at a time. The reader accepts both one JSON
+object per line and pretty-printed objects written back to back, which is
+how college_admissions_dataset.jsonl is stored.
+"""
+import os
+import re
+import json
+import hashlib
+from collections import Counter
+from typing import Dict, Any, Iterator, Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_FILE = os.path.join(BASE_DIR, "college_admissions_dataset.jsonl")
+FALLBACK_DATASET_FILE = os.path.join(BASE_DIR, "college_faq.jsonl")
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+def find_dataset_file() -> Optional[str]:
+    """Path of the dataset to index, preferring college_admissions_dataset.jsonl"""
+    for path in (DATASET_FILE, FALLBACK_DATASET_FILE):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def iter_records(path: str, chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+    """Yield the JSON records of a dataset file without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            stripped = buffer.lstrip()
+            if not stripped:
+                if eof:
+                    return
+                buffer = f.read(chunk_size)
+                eof = not buffer
+                continue
+
+            try:
+                record, end = decoder.raw_decode(stripped)
+            except json.JSONDecodeError:
+                # The record may continue past the end of the buffer
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = stripped + chunk
+                continue
+
+            buffer = stripped[end:]
+            yield record
+
+
+def record_text(record: Dict[str, Any]) -> str:
+    """The indexed text of a record"""
+    return record.get("text", "")
+
+
+def record_metadata(record: Dict[str, Any]) -> Dict[str, Any]:
+    """The metadata stored with a record's chunks"""
+    metadata = record.get("metadata", {})
+    return {"keywords": metadata.get("keywords", []), "category": metadata.get("category", "")}
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """Content hash identifying a record, changes whenever its text or metadata change"""
+    content = json.dumps({"text": record_text(record), "metadata": record_metadata(record)}, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+
+def file_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Content hash of a whole dataset file, used as the dataset version"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_vocabulary(path: str) -> Counter:
+    """Count the words of the dataset's texts and keywords"""
+    vocabulary = Counter()
+    for record in iter_records(path):
+        vocabulary.update(WORD_PATTERN.findall(record_text(record).lower()))
+        for keyword in record_metadata(record)["keywords"]:
+            vocabulary.update(WORD_PATTERN.findall(keyword.lower()))
+    return vocabulary
@@ -0,0 +1,281 @@
+"""
+RAG Engine - Long-lived retrieval engine for the college admissions assistant
+
+This module keeps the embedding model, the vector store and the QA chain loaded
+for the lifetime of the process, so individual queries only pay for retrieval
+and generation. A single shared instance is used by the API server and by the
+Jarvis LLM service.
+"""
+import os
+import re
+import threading
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from langchain.embeddings import HuggingFaceEmbeddings
+from langchain.vectorstores import Chroma
+from langchain.chains import RetrievalQA
+from langchain.llms import Ollama
+from langchain.prompts import PromptTemplate
+
+from embedding_cache import CachedEmbeddings, QueryEmbeddingCache
+from rag_retrieval import BM25Index, HybridRetriever
+from vector_store import FlatVectorStore
+
+logger = logging.getLogger("rag-engine")
+
+# RAG configuration
+INDEX_DIR = os.environ.get("RAG_INDEX_DIR", "college_faq_index")
+EMBEDDING_MODEL = os.environ.get("RAG_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+LLM_MODEL = os.environ.get("RAG_LLM_MODEL", "gemma:2b")
+RETRIEVER_K = int(os.environ.get("RAG_RETRIEVER_K", "3"))
+HYBRID_RETRIEVAL = os.environ.get("RAG_HYBRID", "true").lower() == "true"
+HYBRID_FETCH_K = int(os.environ.get("RAG_HYBRID_FETCH_K", "20"))
+HYBRID_ALPHA = float(os.environ.get("RAG_HYBRID_ALPHA", "0.6"))
+EXTRACTIVE_ANSWERS = os.environ.get("RAG_EXTRACTIVE", "true").lower() == "true"
+EXTRACTIVE_THRESHOLD = float(os.environ.get("RAG_EXTRACTIVE_THRESHOLD", "0.75"))
+# "chroma", "flat" (memory-mapped float32 matrix) or "flat-int8" (quantized matrix)
+VECTOR_BACKEND = os.environ.get("RAG_VECTOR_BACKEND", "chroma").lower()
+VECTOR_BACKENDS = ("chroma", "flat", "flat-int8")
+QUERY_CACHE_SIZE = int(os.environ.get("RAG_QUERY_CACHE_SIZE", "1024"))
+# SQLite file shared by all processes, the on-disk tier is off when unset
+QUERY_CACHE_DB = os.environ.get("RAG_QUERY_CACHE_DB", "")
+
+# Dataset records are "Q: ... A: ..." pairs, the answer span follows the "A:" marker
+ANSWER_PATTERN = re.compile(r"\bA:\s*(.+)", re.DOTALL)
+COLLECTION_NAME = "langchain"  # langchain's default Chroma collection
+
+QA_PROMPT = PromptTemplate(
+    template=(
+        "Based on the following context, answer the question. If the answer is not in the context, "
+        "say 'I don't have information about that in my knowledge base.'\n\n"
+        "Context: {context}\n\nQuestion: {question}\n\nAnswer:"
+    ),
+    input_variables=["context", "question"]
+)
+
+
+def extract_answer(text: str) -> Optional[str]:
+    """The answer span of a "Q: ... A: ..." chunk, or None if the chunk has none"""
+    match = ANSWER_PATTERN.search(text)
+    if match is None:
+        return None
+    return match.group(1).strip() or None
+
+
+def open_vector_store(embedding, index_dir: str = INDEX_DIR, backend: str = VECTOR_BACKEND):
+    """Open the index directory with the configured vector store backend"""
+    if backend == "chroma":
+        return Chroma(collection_name=COLLECTION_NAME, persist_directory=index_dir, embedding_function=embedding)
+    if backend in ("flat", "flat-int8"):
+        return FlatVectorStore(index_dir, embedding_function=embedding, quantize=backend == "flat-int8")
+    raise ValueError(f"Unknown vector backend '{backend}', expected one of {', '.join(VECTOR_BACKENDS)}")
+
+
+class RagEngine:
+    """Holds the embedder, vector store and QA chain for repeated RAG queries"""
+
+    def __init__(self, index_dir: str = INDEX_DIR, embedding_model: str = EMBEDDING_MODEL,
+                 llm_model: str = LLM_MODEL, k: int = RETRIEVER_K, hybrid: bool = HYBRID_RETRIEVAL,
+                 extractive: bool = EXTRACTIVE_ANSWERS, extractive_threshold: float = EXTRACTIVE_THRESHOLD,
+                 vector_backend: str = VECTOR_BACKEND, llm: Optional[Any] = None):
+        self.index_dir = index_dir
+        self.embedding_model = embedding_model
+        self.llm_model = llm_model
+        self.k = k
+        self.hybrid = hybrid
+        self.extractive = extractive
+        self.extractive_threshold = extractive_threshold
+        self.vector_backend = vector_backend
+        self.llm = llm  # used instead of the Ollama model when given, e.g. a stub in benchmarks
+        self._lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"queries": 0, "extractive": 0, "generated": 0}
+        # Outlives reloads, the cache is keyed by embedding model
+        self.query_cache = QueryEmbeddingCache(embedding_model, QUERY_CACHE_SIZE, QUERY_CACHE_DB or None)
+        self._embedding = None
+        self._db = None
+        self._llm = None
+        self._retriever = None
+        self._qa_chain = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the engine currently holds a ready QA chain"""
+        return self._qa_chain is not None
+
+    def load(self) -> None:
+        """Load the embedder, vector store and QA chain if not already loaded"""
+        with self._lock:
+            if self.loaded:
+                return
+
+            logger.info(f"Loading RAG engine (index: {self.index_dir}, backend: {self.vector_backend}, "
+                        f"embeddings: {self.embedding_model})")
+            embedding = CachedEmbeddings(HuggingFaceEmbeddings(model_name=self.embedding_model), self.query_cache)
+            db = open_vector_store(embedding, self.index_dir, self.vector_backend)
+            llm = self.llm if self.llm is not None else Ollama(model=self.llm_model)
+
+            if self.hybrid:
+                # Keyword index over the stored chunks, fused with vector scores
+                retriever = HybridRetriever(
+                    vectorstore=db,
+                    index=BM25Index.from_vectorstore(db),
+                    k=self.k,
+                    fetch_k=HYBRID_FETCH_K,
+                    alpha=HYBRID_ALPHA
+                )
+            else:
+                retriever = db.as_retriever(
+                    search_type="similarity",
+                    search_kwargs={"k": self.k}
+                )
+            qa_chain = RetrievalQA.from_chain_type(
+                llm=llm,
+                retriever=retriever,
+                return_source_documents=True,
+                chain_type_kwargs={"prompt": QA_PROMPT}
+            )
+
+            self._embedding = embedding
+            self._db = db
+            self._llm = llm
+            self._retriever = retriever
+            self._qa_chain = qa_chain
+            logger.info("RAG engine loaded")
+
+    def warm_up(self) -> bool:
+        """
+        Load the engine and run one retrieval so the first real query does not
+        pay for model initialisation.
+        """
+        try:
+            self.load()
+            self._db.similarity_search("college admission", k=1)
+            logger.info("RAG engine warmed up")
+            return True
+        except Exception as e:
+            logger.error(f"Error warming up RAG engine: {str(e)}")
+            return False
+
+    def reload(self) -> None:
+        """Drop the loaded components and load them again, e.g. after the index was rebuilt"""
+        with self._lock:
+            self.close()
+            self.load()
+
+    def close(self) -> None:
+        """Release the loaded components"""
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._db.persist()
+                except Exception as e:
+                    logger.warning(f"Error persisting vector store on close: {str(e)}")
+            self._embedding = None
+            self._db = None
+            self._llm = None
+            self._retriever = None
+            self._qa_chain = None
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query with the engine's embedding model"""
+        self.load()
+        return self._embedding.embed_query(text)
+
+    def retrieve(self, query_text: str) -> List[Tuple[Any, float]]:
+        """
+        Retrieve the top chunks for a query.
+
+        Returns (document, confidence) pairs, best first, where confidence is the
+        chunk's vector similarity to the query.
+        """
+        self.load()
+        retriever, db = self._retriever, self._db
+        if retriever is None:
+            raise RuntimeError("RAG engine was closed during query")
+
+        if isinstance(retriever, HybridRetriever):
+            return [(doc, similarity) for doc, _, similarity in retriever.get_scored_documents(query_text)]
+        return db.similarity_search_with_relevance_scores(query_text, k=self.k)
+
+    def query(self, query_text: str, retrieval_query: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Answer a query from the knowledge base.
+
+        Chunks are retrieved for retrieval_query, e.g. the query with typos
+        corrected, if given. Returns a dict with the answer, the source document
+        texts, the retrieval confidence and whether the answer was extracted or
+        generated.
+        """
+        return self.answer(query_text, self.retrieve(retrieval_query or query_text))
+
+    def answer(self, query_text: str, hits: List[Tuple[Any, float]]) -> Dict[str, Any]:
+        """Answer a query from chunks already retrieved for it, see query"""
+        confidence = hits[0][1] if hits else 0.0
+
+        # Fast path: a confident match on a Q/A record already holds the answer, unless
+        # the record was split and the chunk may hold only part of it
+        if (self.extractive and hits and confidence >= self.extractive_threshold and
+                hits[0][0].metadata.get("chunks") == 1):
+            answer = extract_answer(hits[0][0].page_content)
+            if answer:
+                self._count("extractive")
+                return {
+                    "answer": answer,
+                    "sources": [hits[0][0].page_content],
+                    "confidence": confidence,
+                    "mode": "extractive"
+                }
+
+        qa_chain = self._qa_chain
+        if qa_chain is None:
+            raise RuntimeError("RAG engine was closed during query")
+
+        # Generate from the chunks already retrieved instead of retrieving again
+        docs = [doc for doc, _ in hits]
+        answer = qa_chain.combine_documents_chain.run(input_documents=docs, question=query_text)
+        self._count("generated")
+        return {
+            "answer": answer,
+            "sources": [doc.page_content for doc in docs],
+            "confidence": confidence,
+            "mode": "generated"
+        }
+
+    def _count(self, mode: str) -> None:
+        with self._stats_lock:
+            self._stats["queries"] += 1
+            self._stats[mode] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Query counts and how often the extractive fast path answered"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["fast_path_ratio"] = stats["extractive"] / stats["queries"] if stats["queries"] else 0.0
+        stats["loaded"] = self.loaded
+        stats["vector_backend"] = self.vector_backend
+        stats["query_cache"] = self.query_cache.stats()
+        return stats
+
+
+# Shared engine instance
+_engine: Optional[RagEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_rag_engine() -> RagEngine:
+    """Return the process-wide RAG engine, creating it on first use"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = RagEngine()
+        return _engine
+
+
+def close_rag_engine() -> None:
+    """Close the process-wide RAG engine if it was created"""
+    with _engine_lock:
+        if _engine is not None:
+            _engine.close()
+            _engine.query_cache.close()
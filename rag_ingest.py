@@ -0,0 +1,239 @@
+"""
+RAG Ingest - Streaming ingestion of large knowledge bases into the vector index
+
+Reads a JSONL dataset lazily, splits records into chunks and embeds them in
+batches across a pool of worker processes, each holding its own copy of the
+embedding model. Embedded batches are written to the configured vector store
+(Chroma or the flat memory-mapped store) in bulk.
+Like setup_vector_db, only records missing from the index manifest are
+embedded, and records no longer in the dataset are removed. The manifest
+records the input file, and setup_vector_db leaves an index built from
+another file alone.
+
+Usage:
+    python rag_ingest.py [--input FILE] [--batch-size N] [--workers N]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from rag_dataset import find_dataset_file, iter_records, record_hash, file_hash
+
+# Embedding model of each worker process
+_worker_model = None
+
+
+def _init_worker(model_name):
+    """Load the embedding model once per worker process"""
+    global _worker_model
+    from sentence_transformers import SentenceTransformer
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _embed_batch(texts):
+    """Embed one batch of chunk texts in a worker process"""
+    return _worker_model.encode(texts, batch_size=len(texts)).tolist()
+
+
+def iter_chunk_batches(records, splitter, chunk_record, skip, batch_size):
+    """
+    Group the chunks of new records into batches.
+
+    Yields (texts, metadatas, ids, record_chunk_ids) tuples, where record_chunk_ids
+    maps each record completed in the batch to its chunk ids.
+    """
+    texts, metadatas, ids, record_chunk_ids = [], [], [], {}
+    for record_id, record in records:
+        if record_id in skip:
+            continue
+        record_texts, record_metadatas, chunk_ids = chunk_record(record, record_id, splitter)
+        texts.extend(record_texts)
+        metadatas.extend(record_metadatas)
+        ids.extend(chunk_ids)
+        record_chunk_ids[record_id] = chunk_ids
+
+        if len(texts) >= batch_size:
+            yield texts, metadatas, ids, record_chunk_ids
+            texts, metadatas, ids, record_chunk_ids = [], [], [], {}
+
+    if texts:
+        yield texts, metadatas, ids, record_chunk_ids
+
+
+class ProgressReporter:
+    """Prints ingestion progress and throughput"""
+
+    def __init__(self, interval=2.0):
+        self.interval = interval
+        self.start_time = time.time()
+        self.last_report = 0.0
+        self.records = 0
+        self.chunks = 0
+
+    def update(self, records, chunks, force=False):
+        self.records += records
+        self.chunks += chunks
+        now = time.time()
+        if force or now - self.last_report >= self.interval:
+            self.last_report = now
+            elapsed = max(now - self.start_time, 1e-9)
+            print(f"Embedded {self.records} records / {self.chunks} chunks "
+                  f"in {elapsed:.1f}s ({self.chunks / elapsed:.1f} chunks/s)")
+
+
+def ingest(data_file, batch_size=256, workers=None, chunk_size=1000, chunk_overlap=200, prune=True):
+    """
+    Ingest a dataset into the vector index.
+
+    Returns a summary dict with record and chunk counts, elapsed time and throughput.
+    """
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from rag_assistant import CHUNK_SCHEMA, chunk_record, load_manifest, save_manifest
+    from rag_engine import (
+        INDEX_DIR, COLLECTION_NAME, EMBEDDING_MODEL, VECTOR_BACKEND, open_vector_store, get_rag_engine
+    )
+
+    start_time = time.time()
+    workers = workers or os.cpu_count() or 1
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    manifest = load_manifest()
+    if manifest and manifest.get("embedding_model") != EMBEDDING_MODEL:
+        print("Index was built with another embedding model, run setup_vector_db to rebuild it first")
+        return None
+    if manifest and manifest.get("vector_backend", "chroma") != VECTOR_BACKEND:
+        print("Index was built with another vector backend, run setup_vector_db to rebuild it first")
+        return None
+    if ((manifest is None or manifest.get("chunk_schema") != CHUNK_SCHEMA) and
+            os.path.isdir(INDEX_DIR) and os.listdir(INDEX_DIR)):
+        # Chunks of an index without a manifest have unknown ids and would be duplicated,
+        # chunks with older metadata would never be replaced
+        print("Existing vector database cannot be updated incrementally, rebuilding it...")
+        get_rag_engine().close()
+        shutil.rmtree(INDEX_DIR)
+        manifest = None
+    indexed = manifest["records"] if manifest else {}
+    records = dict(indexed)
+
+    if VECTOR_BACKEND == "chroma":
+        import chromadb
+        client = chromadb.PersistentClient(path=INDEX_DIR)
+        collection = client.get_or_create_collection(COLLECTION_NAME)
+        store = None
+
+        def write_batch(texts, embeddings, metadatas, ids):
+            collection.upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=texts)
+
+        delete_chunks = collection.delete
+    else:
+        # Embeddings come from the workers, the store never embeds itself
+        store = open_vector_store(None)
+        write_batch = store.add_embeddings
+        delete_chunks = store.delete
+
+    # Record ids seen in the dataset, used to find removed records
+    seen = set()
+
+    def iter_new_records():
+        for record in iter_records(data_file):
+            record_id = record_hash(record)
+            if record_id in seen:
+                continue
+            seen.add(record_id)
+            yield record_id, record
+
+    progress = ProgressReporter()
+    batches = iter_chunk_batches(iter_new_records(), splitter, chunk_record, indexed, batch_size)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(EMBEDDING_MODEL,)) as pool:
+        in_flight = {}
+
+        def write_completed(done):
+            for future in done:
+                texts, metadatas, ids, record_chunk_ids = in_flight.pop(future)
+                write_batch(texts, future.result(), metadatas, ids)
+                records.update(record_chunk_ids)
+                progress.update(len(record_chunk_ids), len(texts))
+
+        # Keep a bounded number of batches in flight so memory stays flat on large inputs
+        for batch in batches:
+            if len(in_flight) >= workers * 2:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                write_completed(done)
+            in_flight[pool.submit(_embed_batch, batch[0])] = batch
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            write_completed(done)
+
+    removed = [record_id for record_id in indexed if record_id not in seen] if prune else []
+    stale_ids = [chunk_id for record_id in removed for chunk_id in records.pop(record_id)]
+    if stale_ids:
+        delete_chunks(ids=stale_ids)
+    if store is not None:
+        store.persist()
+
+    save_manifest({
+        "dataset_file": os.path.basename(data_file),
+        "dataset_version": file_hash(data_file),
+        "embedding_model": EMBEDDING_MODEL,
+        "vector_backend": VECTOR_BACKEND,
+        "chunk_schema": CHUNK_SCHEMA,
+        "updated": time.time(),
+        "records": records
+    })
+
+    # Make a running engine pick up the changed index
+    engine = get_rag_engine()
+    if engine.loaded and (progress.chunks or removed):
+        engine.reload()
+
+    elapsed = time.time() - start_time
+    progress.update(0, 0, force=True)
+    return {
+        "records": len(seen),
+        "embedded_records": progress.records,
+        "embedded_chunks": progress.chunks,
+        "removed_records": len(removed),
+        "seconds": elapsed,
+        "chunks_per_second": progress.chunks / elapsed if elapsed else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a JSONL knowledge base into the RAG vector index")
+    parser.add_argument("--input", default=find_dataset_file(), help="JSONL dataset to ingest")
+    parser.add_argument("--batch-size", type=int, default=256, help="Chunks per embedding batch")
+    parser.add_argument("--workers", type=int, default=None, help="Embedding processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Maximum characters per chunk")
+    parser.add_argument("--chunk-overlap", type=int, default=200, help="Characters shared by adjacent chunks")
+    parser.add_argument("--no-prune", action="store_true", help="Keep indexed records missing from the input")
+    args = parser.parse_args()
+
+    if not args.input or not os.path.exists(args.input):
+        print(f"Error: Missing dataset file {args.input}")
+        sys.exit(1)
+
+    print(f"Ingesting {args.input}...")
+    summary = ingest(
+        args.input,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        prune=not args.no_prune
+    )
+    if summary is None:
+        sys.exit(1)
+
+    print(f"Done: {summary['records']} records, {summary['embedded_records']} embedded "
+          f"({summary['embedded_chunks']} chunks), {summary['removed_records']} removed "
+          f"in {summary['seconds']:.1f}s ({summary['chunks_per_second']:.1f} chunks/s)")
+
+
+if __name__ == "__main__":
+    main()
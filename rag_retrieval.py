@@ -0,0 +1,193 @@
+"""
+RAG Retrieval - Hybrid keyword and vector retrieval for the RAG engine
+
+An in-memory BM25 inverted index over chunk texts and their metadata keywords
+is fused with the vector store's similarity scores. Queries that clearly name a
+topic are pre-filtered to the matching dataset categories, and chunks whose
+keywords appear in the query are boosted.
+"""
+import re
+import math
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from langchain.schema import BaseRetriever, Document
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "at", "be", "by", "can", "do", "does", "for", "from", "how", "i",
+    "in", "is", "it", "me", "my", "of", "on", "or", "the", "to", "what", "when", "where",
+    "which", "who", "will", "with", "you", "your"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens without stopwords, with plural 's' stripped"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def split_keywords(keywords: Any) -> List[str]:
+    """Metadata keywords as a list, whether stored as a list or a comma-separated string"""
+    if isinstance(keywords, str):
+        return [keyword.strip() for keyword in keywords.split(",") if keyword.strip()]
+    return list(keywords or [])
+
+
+class BM25Index:
+    """In-memory BM25 inverted index over chunk texts and their metadata keywords"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, keyword_weight: int = 2):
+        self.k1 = k1
+        self.b = b
+        self.keyword_weight = keyword_weight
+        self.texts: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.keyword_phrases: List[List[str]] = []
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._lengths: List[int] = []
+        self._category_terms: Dict[str, Set[str]] = defaultdict(set)
+        self._doc_ids: Dict[str, int] = {}
+
+    def add(self, text: str, metadata: Dict[str, Any]) -> None:
+        """Index one chunk"""
+        doc_id = len(self.texts)
+        keywords = split_keywords(metadata.get("keywords"))
+        category = metadata.get("category", "")
+
+        # Keywords count more than body text
+        tokens = tokenize(text)
+        for keyword in keywords:
+            tokens.extend(tokenize(keyword) * self.keyword_weight)
+
+        for token, count in Counter(tokens).items():
+            self._postings[token][doc_id] = count
+        self._lengths.append(len(tokens))
+        self.texts.append(text)
+        self.metadatas.append(metadata)
+        self.keyword_phrases.append([keyword.lower() for keyword in keywords])
+        self._doc_ids[text] = doc_id
+
+        if category:
+            self._category_terms[category].update(tokenize(category))
+            for keyword in keywords:
+                self._category_terms[category].update(tokenize(keyword))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def doc_id(self, text: str) -> Optional[int]:
+        """Index of the chunk with the given text"""
+        return self._doc_ids.get(text)
+
+    def match_categories(self, query_tokens: Sequence[str], min_overlap: int = 2) -> List[str]:
+        """Categories whose name and keywords share the most terms with the query, if clear enough"""
+        terms = set(query_tokens)
+        scores = {category: len(terms & category_terms) for category, category_terms in self._category_terms.items()}
+        best = max(scores.values(), default=0)
+        if best < min_overlap:
+            return []
+        return [category for category, score in scores.items() if score == best]
+
+    def search(self, query_tokens: Sequence[str], categories: Optional[Sequence[str]] = None,
+               limit: int = 20) -> List[Tuple[int, float]]:
+        """BM25 scores of the best matching chunks as (doc_id, score) pairs"""
+        count = len(self.texts)
+        if not count:
+            return []
+        avg_length = sum(self._lengths) / count
+
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(query_tokens):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                if categories and self.metadatas[doc_id].get("category") not in categories:
+                    continue
+                norm = 1 - self.b + self.b * self._lengths[doc_id] / avg_length
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    @classmethod
+    def from_vectorstore(cls, db) -> "BM25Index":
+        """Build the index from all chunks stored in a Chroma vector store"""
+        index = cls()
+        stored = db.get(include=["documents", "metadatas"])
+        for text, metadata in zip(stored["documents"], stored["metadatas"]):
+            index.add(text, metadata or {})
+        return index
+
+
+class HybridRetriever(BaseRetriever):
+    """Retriever fusing BM25 keyword scores with vector similarity scores"""
+
+    vectorstore: Any
+    index: Any
+    k: int = 3
+    fetch_k: int = 20
+    alpha: float = 0.6  # weight of the vector score, the rest goes to BM25
+    keyword_boost: float = 0.1  # added per metadata keyword phrase found in the query
+    min_category_overlap: int = 2
+
+    def _category_filter(self, categories: List[str]) -> Optional[Dict[str, Any]]:
+        if not categories:
+            return None
+        if len(categories) == 1:
+            return {"category": categories[0]}
+        return {"$or": [{"category": category} for category in categories]}
+
+    def get_scored_documents(self, query: str) -> List[Tuple[Document, float, float]]:
+        """The top k chunks with their fused and vector similarity scores, best first"""
+        query_tokens = tokenize(query)
+        query_lower = query.lower()
+        categories = self.index.match_categories(query_tokens, self.min_category_overlap)
+
+        vector_hits = self.vectorstore.similarity_search_with_relevance_scores(
+            query, k=self.fetch_k, filter=self._category_filter(categories)
+        )
+        if categories and not vector_hits:
+            # The category guess filtered out everything, search the whole index
+            categories = []
+            vector_hits = self.vectorstore.similarity_search_with_relevance_scores(query, k=self.fetch_k)
+
+        keyword_hits = self.index.search(query_tokens, categories, self.fetch_k)
+        max_keyword_score = keyword_hits[0][1] if keyword_hits else 0.0
+
+        # Fuse by chunk text, which identifies a chunk in both result sets
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for doc, score in vector_hits:
+            candidates[doc.page_content] = {"doc": doc, "vector": max(score, 0.0), "keyword": 0.0}
+        for doc_id, score in keyword_hits:
+            text = self.index.texts[doc_id]
+            entry = candidates.setdefault(text, {
+                "doc": Document(page_content=text, metadata=self.index.metadatas[doc_id]),
+                "vector": 0.0,
+                "keyword": 0.0
+            })
+            entry["keyword"] = score / max_keyword_score if max_keyword_score else 0.0
+
+        scored = []
+        for text, entry in candidates.items():
+            score = self.alpha * entry["vector"] + (1 - self.alpha) * entry["keyword"]
+            doc_id = self.index.doc_id(text)
+            if doc_id is not None:
+                score += self.keyword_boost * sum(
+                    1 for phrase in self.index.keyword_phrases[doc_id] if phrase in query_lower
+                )
+            scored.append((entry["doc"], score, entry["vector"]))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:self.k]
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> List[Document]:
+        return [doc for doc, _, _ in self.get_scored_documents(query)]
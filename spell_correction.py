@@ -0,0 +1,148 @@
+"""
+Spell Correction - Correct query words against a known vocabulary
+
+Words are indexed in a BK-tree, so looking up the closest words within a small
+edit distance only visits a fraction of the vocabulary.
+"""
+import os
+import re
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("spell-correction")
+
+# General English word list, when the system has one, so ordinary words are never corrected
+DICTIONARY_FILE = os.environ.get("SPELL_DICTIONARY", "/usr/share/dict/words")
+
+
+def load_dictionary(path: str = DICTIONARY_FILE) -> set:
+    """Lower-cased alphabetic words of a one-word-per-line list, empty if it cannot be read"""
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return {word for word in (line.strip().lower() for line in f) if word.isalpha()}
+    except OSError:
+        return set()
+
+
+def edit_distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """
+    Levenshtein distance between two words.
+
+    With a limit, returns limit + 1 as soon as the distance is known to exceed it.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree of words keyed by edit distance"""
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        """Insert a word"""
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return
+
+        node_word, children = self._root
+        while True:
+            distance = edit_distance(word, node_word)
+            if distance == 0:
+                return
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (word, {})
+                self._size += 1
+                return
+            node_word, children = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """All words within max_distance of the given word, as (distance, word) pairs"""
+        if self._root is None:
+            return []
+
+        results = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = edit_distance(word, node_word)
+            if distance <= max_distance:
+                results.append((distance, node_word))
+            # Triangle inequality: only subtrees at these distances can hold matches
+            for child_distance in range(distance - max_distance, distance + max_distance + 1):
+                child = children.get(child_distance)
+                if child is not None:
+                    stack.append(child)
+        return results
+
+    def __len__(self):
+        return self._size
+
+
+class SpellCorrector:
+    """
+    Corrects unknown words to the closest frequent target word.
+
+    Words in the vocabulary or the dictionary, and plurals of them, are known
+    and left alone. Only targets, by default the whole vocabulary, are offered
+    as corrections.
+    """
+
+    def __init__(self, vocabulary: Counter, targets: Optional[Iterable[str]] = None,
+                 dictionary: Optional[set] = None, min_length: int = 5):
+        self.vocabulary = vocabulary
+        self.dictionary = dictionary or set()
+        self.min_length = min_length
+        targets = vocabulary if targets is None else targets
+        self._tree = BKTree(word for word in targets if len(word) >= min_length - 2)
+
+    def is_known(self, word: str) -> bool:
+        """Whether a word, or the singular of a plural, is in the vocabulary or dictionary"""
+        if word in self.vocabulary or word in self.dictionary:
+            return True
+        return word.endswith("s") and (word[:-1] in self.vocabulary or word[:-1] in self.dictionary)
+
+    def max_distance(self, word: str) -> int:
+        """Allowed edit distance, which grows with word length"""
+        return 1 if len(word) < 8 else 2
+
+    def correct_word(self, word: str) -> str:
+        """The word itself if known or uncorrectable, otherwise its best correction"""
+        if len(word) < self.min_length or not word.isalpha() or self.is_known(word):
+            return word
+
+        candidates = self._tree.search(word, self.max_distance(word))
+        if not candidates:
+            return word
+
+        # Prefer the closest word, then the most frequent one
+        _, best = min(candidates, key=lambda candidate: (candidate[0], -self.vocabulary[candidate[1]]))
+        logger.debug(f"Corrected '{word}' to '{best}'")
+        return best
+
+    def correct(self, text: str) -> str:
+        """Correct every word of a lower-cased text, keeping punctuation and spacing"""
+        return re.sub(r"[a-z]+", lambda match: self.correct_word(match.group()), text)
@@ -0,0 +1,229 @@
+"""
+STT Backends - Pluggable speech recognition and voice activity detection
+
+Every backend transcribes raw mono PCM. "google" uses the Google Web Speech
+API through SpeechRecognition, "sphinx" runs CMU PocketSphinx offline and
+"stub" returns a fixed description of the audio without any engine, for
+tests and load testing.
+
+VoiceSegmenter splits a stream of small PCM chunks into utterances with an
+adaptive energy threshold, so the API server can send partial transcripts
+while someone speaks and a final one when they stop.
+"""
+import os
+import math
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import speech_recognition as sr
+    speech_recognition_available = True
+except ImportError:
+    speech_recognition_available = False
+
+try:
+    import pocketsphinx  # noqa: F401, used by Recognizer.recognize_sphinx
+    pocketsphinx_available = True
+except ImportError:
+    pocketsphinx_available = False
+
+DEFAULT_STT_BACKEND = os.environ.get("STT_BACKEND", "google").lower()
+
+# Recognizers are reused per thread, they keep mutable calibration state
+_local = threading.local()
+
+
+def get_recognizer() -> "sr.Recognizer":
+    """The calling thread's speech recognizer"""
+    recognizer = getattr(_local, "recognizer", None)
+    if recognizer is None:
+        recognizer = _local.recognizer = sr.Recognizer()
+    return recognizer
+
+
+class STTBackend:
+    """Transcribes raw mono PCM audio"""
+
+    name = ""
+
+    def available(self) -> bool:
+        return False
+
+    def transcribe(self, pcm: bytes, sample_rate: int, sample_width: int, language: str = "en-US") -> str:
+        """The transcript of the audio, or an empty string if no speech was recognized"""
+        raise NotImplementedError
+
+
+class GoogleSTTBackend(STTBackend):
+    """Google Web Speech API"""
+
+    name = "google"
+
+    def available(self) -> bool:
+        return speech_recognition_available
+
+    def transcribe(self, pcm: bytes, sample_rate: int, sample_width: int, language: str = "en-US") -> str:
+        try:
+            return get_recognizer().recognize_google(sr.AudioData(pcm, sample_rate, sample_width), language=language)
+        except sr.UnknownValueError:
+            return ""
+
+
+class SphinxSTTBackend(STTBackend):
+    """Offline CMU PocketSphinx"""
+
+    name = "sphinx"
+
+    def available(self) -> bool:
+        return speech_recognition_available and pocketsphinx_available
+
+    def transcribe(self, pcm: bytes, sample_rate: int, sample_width: int, language: str = "en-US") -> str:
+        try:
+            return get_recognizer().recognize_sphinx(sr.AudioData(pcm, sample_rate, sample_width), language=language)
+        except sr.UnknownValueError:
+            return ""
+
+
+class StubSTTBackend(STTBackend):
+    """Engine-free stand-in returning a fixed text, or the audio duration if none is set"""
+
+    name = "stub"
+
+    def __init__(self, text: Optional[str] = None):
+        self.text = text if text is not None else os.environ.get("STT_STUB_TEXT")
+
+    def available(self) -> bool:
+        return True
+
+    def transcribe(self, pcm: bytes, sample_rate: int, sample_width: int, language: str = "en-US") -> str:
+        if self.text is not None:
+            return self.text
+        return f"{len(pcm) / (sample_rate * sample_width):.1f} seconds of speech"
+
+
+STT_BACKENDS: Dict[str, STTBackend] = {
+    backend.name: backend for backend in (GoogleSTTBackend(), SphinxSTTBackend(), StubSTTBackend())
+}
+
+
+def get_stt_backend(name: Optional[str] = None) -> STTBackend:
+    """The named backend, or the configured default, raising ValueError if it is unknown or unavailable"""
+    name = (name or DEFAULT_STT_BACKEND).lower()
+    backend = STT_BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown STT backend '{name}', expected one of {', '.join(STT_BACKENDS)}")
+    if not backend.available():
+        raise ValueError(f"STT backend '{name}' is not available on this server")
+    return backend
+
+
+def frame_rms(frame: bytes) -> float:
+    """Root mean square amplitude of a frame of 16-bit little-endian PCM"""
+    samples = array("h", frame[:len(frame) - len(frame) % 2])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+
+class VoiceSegmenter:
+    """
+    Energy-based voice activity detection over 16-bit mono PCM.
+
+    Audio is cut into fixed frames. A frame is speech when its energy is well
+    above the running noise floor. An utterance starts after start_ms of
+    speech frames, keeps pre_roll_ms of audio from before that so the first
+    syllable is not clipped, and ends after silence_ms without speech or at
+    max_utterance_ms.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 30, start_ms: int = 90,
+                 silence_ms: int = 600, pre_roll_ms: int = 300, max_utterance_ms: int = 15000,
+                 threshold_ratio: float = 3.0, min_threshold: float = 300.0):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_bytes = sample_rate * frame_ms // 1000 * 2
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.silence_frames = max(1, silence_ms // frame_ms)
+        self.pre_roll_frames = pre_roll_ms // frame_ms
+        self.max_frames = max_utterance_ms // frame_ms
+        self.threshold_ratio = threshold_ratio
+        self.min_threshold = min_threshold
+
+        self.noise_floor = min_threshold / threshold_ratio
+        self.in_speech = False
+        self._pending = b""
+        self._recent: List[bytes] = []  # frames before speech, kept for the pre-roll
+        self._voiced_run = 0
+        self._silent_run = 0
+        self._utterance: List[bytes] = []
+
+    @property
+    def utterance(self) -> bytes:
+        """Audio of the utterance in progress"""
+        return b"".join(self._utterance)
+
+    @property
+    def utterance_ms(self) -> int:
+        """Length of the utterance in progress"""
+        return len(self._utterance) * self.frame_ms
+
+    def _is_speech(self, frame: bytes) -> bool:
+        energy = frame_rms(frame)
+        threshold = max(self.min_threshold, self.noise_floor * self.threshold_ratio)
+        if energy < threshold:
+            # Track the background level on non-speech frames only
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * energy
+            return False
+        return True
+
+    def feed(self, pcm: bytes) -> List[Tuple[str, bytes]]:
+        """
+        Add audio and return the events it completes, in order.
+
+        Events are ("start", b"") when an utterance begins and ("end", audio)
+        with the whole utterance when it ends.
+        """
+        events = []
+        data = self._pending + pcm
+        usable = len(data) - len(data) % self.frame_bytes
+        self._pending = data[usable:]
+
+        for offset in range(0, usable, self.frame_bytes):
+            frame = data[offset:offset + self.frame_bytes]
+            speech = self._is_speech(frame)
+
+            if not self.in_speech:
+                self._recent.append(frame)
+                self._voiced_run = self._voiced_run + 1 if speech else 0
+                if self._voiced_run >= self.start_frames:
+                    self.in_speech = True
+                    self._silent_run = 0
+                    keep = self.pre_roll_frames + self._voiced_run
+                    self._utterance = self._recent[-keep:]
+                    self._recent = []
+                    events.append(("start", b""))
+                else:
+                    del self._recent[:-(self.pre_roll_frames + self.start_frames)]
+                continue
+
+            self._utterance.append(frame)
+            self._silent_run = 0 if speech else self._silent_run + 1
+            if self._silent_run >= self.silence_frames or len(self._utterance) >= self.max_frames:
+                events.append(("end", self._finish()))
+        return events
+
+    def flush(self) -> Optional[bytes]:
+        """End the utterance in progress, returning its audio, or None if there is none"""
+        self._pending = b""
+        if not self.in_speech:
+            return None
+        return self._finish()
+
+    def _finish(self) -> bytes:
+        audio = b"".join(self._utterance)
+        self.in_speech = False
+        self._utterance = []
+        self._voiced_run = 0
+        self._silent_run = 0
+        return audio
@@ -0,0 +1,147 @@
+"""
+TTS Backends - Pluggable speech synthesis for the API server
+
+Every backend turns text into a complete audio file in memory. "gtts" calls
+Google's TTS service and returns MP3. "local" synthesizes on this machine,
+with no network round trip, using the espeak-ng / espeak command line
+(several run in parallel on the server's TTS pool) or, failing that,
+pyttsx3, the engine used by the desktop SpeechEngine. It returns WAV.
+"""
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import subprocess
+from typing import Dict, Optional
+
+try:
+    from gtts import gTTS
+    gtts_available = True
+except ImportError:
+    gtts_available = False
+
+try:
+    import pyttsx3
+    pyttsx3_available = True
+except ImportError:
+    pyttsx3_available = False
+
+DEFAULT_TTS_BACKEND = os.environ.get("TTS_BACKEND", "gtts").lower()
+ESPEAK_TIMEOUT = int(os.environ.get("ESPEAK_TIMEOUT", "30"))
+
+
+class TTSBackend:
+    """Synthesizes text to audio bytes; subclasses set the audio format"""
+
+    name = ""
+    media_type = "audio/mpeg"
+    extension = "mp3"
+
+    def available(self) -> bool:
+        return False
+
+    def synthesize(self, text: str, language: str = "en", voice: Optional[str] = None) -> bytes:
+        raise NotImplementedError
+
+    def stream_chunk(self, audio: bytes, first: bool) -> bytes:
+        """The bytes of one synthesized chunk as part of a single continuous stream"""
+        return audio
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS, MP3 output"""
+
+    name = "gtts"
+
+    def available(self) -> bool:
+        return gtts_available
+
+    def synthesize(self, text: str, language: str = "en", voice: Optional[str] = None) -> bytes:
+        from io import BytesIO
+        buffer = BytesIO()
+        gTTS(text=text, lang=language or "en").write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class LocalTTSBackend(TTSBackend):
+    """Offline synthesis with espeak-ng / espeak, or pyttsx3 as a fallback, WAV output"""
+
+    name = "local"
+    media_type = "audio/wav"
+    extension = "wav"
+
+    def __init__(self):
+        self.espeak = shutil.which("espeak-ng") or shutil.which("espeak")
+        # pyttsx3 engines are not thread-safe, calls are serialized
+        self._pyttsx3_lock = threading.Lock()
+        self._pyttsx3_engine = None
+
+    def available(self) -> bool:
+        return bool(self.espeak) or pyttsx3_available
+
+    def synthesize(self, text: str, language: str = "en", voice: Optional[str] = None) -> bytes:
+        if self.espeak:
+            # Text goes in on stdin so it can never be parsed as an option
+            result = subprocess.run(
+                [self.espeak, "--stdout", "--stdin", "-v", voice or language or "en"],
+                input=text.encode("utf-8"),
+                capture_output=True,
+                timeout=ESPEAK_TIMEOUT
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"espeak failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+            return result.stdout
+        if pyttsx3_available:
+            return self._synthesize_pyttsx3(text, voice)
+        raise RuntimeError("No local TTS engine installed (espeak-ng, espeak or pyttsx3)")
+
+    def _synthesize_pyttsx3(self, text: str, voice: Optional[str]) -> bytes:
+        with self._pyttsx3_lock:
+            if self._pyttsx3_engine is None:
+                self._pyttsx3_engine = pyttsx3.init()
+            engine = self._pyttsx3_engine
+            if voice:
+                engine.setProperty("voice", voice)
+
+            # pyttsx3 can only write to a file
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                engine.save_to_file(text, path)
+                engine.runAndWait()
+                with open(path, "rb") as f:
+                    return f.read()
+            finally:
+                os.unlink(path)
+
+    def stream_chunk(self, audio: bytes, first: bool) -> bytes:
+        """
+        Join WAV files into one stream: the first keeps its header, with the
+        sizes set to the streaming placeholder, the others contribute samples only.
+        """
+        data_offset = audio.find(b"data")
+        if not audio.startswith(b"RIFF") or data_offset < 0:
+            return audio
+        if not first:
+            return audio[data_offset + 8:]
+        header = bytearray(audio[:data_offset + 8])
+        struct.pack_into("<I", header, 4, 0xFFFFFFFF)
+        struct.pack_into("<I", header, data_offset + 4, 0xFFFFFFFF)
+        return bytes(header) + audio[data_offset + 8:]
+
+
+TTS_BACKENDS: Dict[str, TTSBackend] = {
+    backend.name: backend for backend in (GTTSBackend(), LocalTTSBackend())
+}
+
+
+def get_tts_backend(name: Optional[str] = None) -> TTSBackend:
+    """The named backend, or the configured default, raising ValueError if it is unknown or unavailable"""
+    name = (name or DEFAULT_TTS_BACKEND).lower()
+    backend = TTS_BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown TTS backend '{name}', expected one of {', '.join(TTS_BACKENDS)}")
+    if not backend.available():
+        raise ValueError(f"TTS backend '{name}' is not available on this server")
+    return backend
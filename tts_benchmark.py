@@ -0,0 +1,118 @@
+"""
+TTS Benchmark - Latency comparison of the API server's TTS backends
+
+Synthesizes a set of short and long phrases with every available backend
+and reports latency percentiles, latency per 100 characters and audio size,
+printing a comparison table and writing a JSON report.
+
+Usage:
+    python tts_benchmark.py [--backends gtts,local] [--runs N] [--output FILE]
+"""
+import sys
+import json
+import time
+import argparse
+from typing import Any, Dict, List
+
+from tts_backends import TTS_BACKENDS
+
+SAMPLE_TEXTS = [
+    "Hello! How can I help you today?",
+    "The application deadline is January 15th.",
+    "Submit your completed application form, mark sheets, transfer certificate and two passport-sized photos.",
+    "Hostel fees include meals and laundry. Rooms are allotted on a first come, first served basis, "
+    "and students from outside the state are given priority during the first round of allotment.",
+]
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Mean and nearest-rank percentiles of latency samples in seconds, as milliseconds"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))] * 1000
+
+    return {
+        "mean": sum(ordered) / len(ordered) * 1000,
+        "p50": rank(50),
+        "p95": rank(95),
+        "max": ordered[-1] * 1000
+    }
+
+
+def benchmark_backend(backend, texts: List[str], runs: int, language: str) -> Dict[str, Any]:
+    """Time every text runs times on one backend, after one untimed warm-up call"""
+    backend.synthesize(texts[0], language)
+
+    latencies, per_char, sizes = [], [], []
+    errors = 0
+    for _ in range(runs):
+        for text in texts:
+            started = time.perf_counter()
+            try:
+                audio = backend.synthesize(text, language)
+            except Exception as e:
+                errors += 1
+                print(f"  {backend.name} error: {e}")
+                continue
+            elapsed = time.perf_counter() - started
+            latencies.append(elapsed)
+            per_char.append(elapsed / len(text))
+            sizes.append(len(audio))
+
+    return {
+        "media_type": backend.media_type,
+        "requests": len(latencies),
+        "errors": errors,
+        "latency_ms": percentiles(latencies),
+        "ms_per_100_chars": sum(per_char) / len(per_char) * 100000 if per_char else None,
+        "mean_audio_bytes": sum(sizes) / len(sizes) if sizes else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare TTS backend latency")
+    parser.add_argument("--backends", default=",".join(TTS_BACKENDS), help="Comma-separated backends to compare")
+    parser.add_argument("--runs", type=int, default=3, help="Times each sample text is synthesized")
+    parser.add_argument("--language", default="en", help="Language code passed to the backends")
+    parser.add_argument("--output", default="tts_benchmark_report.json", help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    results = {}
+    for name in [name.strip() for name in args.backends.split(",") if name.strip()]:
+        backend = TTS_BACKENDS.get(name)
+        if backend is None:
+            print(f"Unknown backend {name}, skipping")
+            continue
+        if not backend.available():
+            print(f"Backend {name} is not available here, skipping")
+            continue
+        print(f"Benchmarking {name}...")
+        try:
+            results[name] = benchmark_backend(backend, SAMPLE_TEXTS, args.runs, args.language)
+        except Exception as e:
+            print(f"  {name} failed: {e}")
+
+    if not results:
+        print("No backend could be benchmarked")
+        sys.exit(1)
+
+    report = {"created": time.time(), "runs": args.runs, "texts": SAMPLE_TEXTS, "backends": results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'backend':<8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'ms/100ch':>9} {'errors':>7}")
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        if not latency:
+            print(f"{name:<8} {'-':>9} {'-':>9} {'-':>9} {'-':>9} {result['errors']:>7}")
+            continue
+        print(f"{name:<8} {latency['p50']:>9.1f} {latency['p95']:>9.1f} {latency['max']:>9.1f} "
+              f"{result['ms_per_100_chars']:>9.1f} {result['errors']:>7}")
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Vector Store - Memory-mapped flat embedding store for small and medium corpora
+
+Embeddings are kept as one NumPy matrix in a .npy file that is memory-mapped
+on load, with ids, texts and metadata in a JSON sidecar. Search is a batched
+dot product over the matrix. An optional int8 variant stores each row
+quantized with its own scale, cutting the file to a quarter of the size.
+
+The store implements the langchain VectorStore interface plus the parts of
+the Chroma API the RAG code uses (get, delete, persist), so it can replace
+Chroma by configuration.
+"""
+import os
+import json
+import math
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain.schema import Document
+from langchain.vectorstores.base import VectorStore
+
+METADATA_FILE = "flat_metadata.json"
+EMBEDDINGS_FILE = "flat_embeddings.npy"
+SCALES_FILE = "flat_scales.npy"
+
+
+def matches_filter(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate a Chroma-style equality filter, with $or and $and, against chunk metadata"""
+    if not where:
+        return True
+    for key, value in where.items():
+        if key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in value):
+                return False
+        elif key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in value):
+                return False
+        elif isinstance(value, dict) and "$in" in value:
+            if metadata.get(key) not in value["$in"]:
+                return False
+        elif metadata.get(key) != value:
+            return False
+    return True
+
+
+class FlatVectorStore(VectorStore):
+    """Flat float32 or int8 embedding matrix, memory-mapped from disk"""
+
+    def __init__(self, persist_directory: str, embedding_function=None, quantize: bool = False,
+                 search_batch_size: int = 65536):
+        self.persist_directory = persist_directory
+        self.embedding_function = embedding_function
+        self.quantize = quantize
+        self.search_batch_size = search_batch_size
+
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}  # id -> row of its live chunk
+        self._matrix = None  # float32 or int8 rows, memory-mapped after load
+        self._scales = None  # per-row dequantization scales for int8 rows
+        # Added rows are collected and replaced or deleted rows only marked,
+        # the matrix is rebuilt once on the next persist or search
+        self._pending: List[Tuple[np.ndarray, Optional[np.ndarray]]] = []
+        self._removed = set()
+        self._dirty = False
+        self._load()
+
+    @property
+    def embeddings(self):
+        return self.embedding_function
+
+    # Storage
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.persist_directory, name)
+
+    def _load(self) -> None:
+        """Memory-map the stored matrix and read the sidecar, if the store exists"""
+        try:
+            with open(self._path(METADATA_FILE), "r", encoding="utf-8") as f:
+                sidecar = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if sidecar.get("quantized", False) != self.quantize:
+            raise ValueError(
+                f"Flat store in {self.persist_directory} was written "
+                f"{'with' if sidecar.get('quantized') else 'without'} int8 quantization"
+            )
+
+        self._ids = sidecar["ids"]
+        self._documents = sidecar["documents"]
+        self._metadatas = sidecar["metadatas"]
+        self._rows = {chunk_id: i for i, chunk_id in enumerate(self._ids)}
+        if self._ids:
+            self._matrix = np.load(self._path(EMBEDDINGS_FILE), mmap_mode="r")
+            if self.quantize:
+                self._scales = np.load(self._path(SCALES_FILE))
+
+    def _compact(self) -> None:
+        """Append pending rows and drop removed ones in a single pass over the matrix"""
+        if not self._pending and not self._removed:
+            return
+        blocks = [np.asarray(self._matrix)] if self._matrix is not None else []
+        blocks.extend(rows for rows, _ in self._pending)
+        scale_blocks = [self._scales] if self._scales is not None else []
+        scale_blocks.extend(scales for _, scales in self._pending)
+        keep = [i for i in range(len(self._ids)) if i not in self._removed]
+
+        if keep:
+            self._matrix = np.concatenate(blocks)
+            self._scales = np.concatenate(scale_blocks) if self.quantize else None
+            if self._removed:
+                self._matrix = self._matrix[keep]
+                self._scales = self._scales[keep] if self.quantize else None
+        else:
+            self._matrix = None
+            self._scales = None
+        self._ids = [self._ids[i] for i in keep]
+        self._documents = [self._documents[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        self._rows = {chunk_id: i for i, chunk_id in enumerate(self._ids)}
+        self._pending = []
+        self._removed = set()
+
+    def persist(self) -> None:
+        """Write pending changes and memory-map the result"""
+        if not self._dirty:
+            return
+        self._compact()
+        os.makedirs(self.persist_directory, exist_ok=True)
+
+        def write_array(name, array):
+            # np.save appends .npy to names without it
+            temp_path = self._path(name + ".tmp.npy")
+            np.save(temp_path, array)
+            os.replace(temp_path, self._path(name))
+
+        if self._ids:
+            write_array(EMBEDDINGS_FILE, np.ascontiguousarray(self._matrix))
+            if self.quantize:
+                write_array(SCALES_FILE, self._scales)
+
+        temp_path = self._path(METADATA_FILE + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "quantized": self.quantize,
+                "dimension": int(self._matrix.shape[1]) if self._matrix is not None else None,
+                "ids": self._ids,
+                "documents": self._documents,
+                "metadatas": self._metadatas
+            }, f)
+        os.replace(temp_path, self._path(METADATA_FILE))
+
+        self._dirty = False
+        self._matrix = None
+        self._scales = None
+        self._load()
+
+    # Writing
+
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Normalize rows and quantize them if configured"""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        if not self.quantize:
+            return vectors.astype(np.float32), None
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+    def add_embeddings(self, texts: List[str], embeddings: List[List[float]],
+                       metadatas: Optional[List[Dict[str, Any]]] = None,
+                       ids: Optional[List[str]] = None) -> List[str]:
+        """Add or replace chunks whose embeddings were computed elsewhere"""
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+
+        # An existing id is replaced: its old row is dropped on the next compaction
+        for chunk_id in ids:
+            row = self._rows.get(chunk_id)
+            if row is not None:
+                self._removed.add(row)
+            self._rows[chunk_id] = len(self._ids)
+            self._ids.append(chunk_id)
+        self._pending.append(self._encode(np.asarray(embeddings, dtype=np.float32)))
+        self._documents.extend(texts)
+        self._metadatas.extend(metadatas)
+        self._dirty = True
+        return ids
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                  ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        """Embed and add or replace chunks"""
+        texts = list(texts)
+        return self.add_embeddings(texts, self.embedding_function.embed_documents(texts), metadatas, ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> None:
+        """Remove chunks by id"""
+        for chunk_id in ids or []:
+            row = self._rows.pop(chunk_id, None)
+            if row is not None:
+                self._removed.add(row)
+                self._dirty = True
+
+    def get(self, include: Optional[List[str]] = None, **kwargs: Any) -> Dict[str, Any]:
+        """All stored chunks, in the shape returned by Chroma's get"""
+        include = include or ["documents", "metadatas"]
+        self._compact()
+        result = {"ids": list(self._ids)}
+        if "documents" in include:
+            result["documents"] = list(self._documents)
+        if "metadatas" in include:
+            result["metadatas"] = list(self._metadatas)
+        return result
+
+    # Search
+
+    def _cosine_scores(self, vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of a query vector to every row, computed in batches"""
+        vector = vector / (np.linalg.norm(vector) or 1.0)
+        scores = np.empty(len(self._ids), dtype=np.float32)
+        for start in range(0, len(self._ids), self.search_batch_size):
+            block = np.asarray(self._matrix[start:start + self.search_batch_size], dtype=np.float32)
+            block_scores = block @ vector
+            if self.quantize:
+                block_scores *= self._scales[start:start + self.search_batch_size]
+            scores[start:start + len(block)] = block_scores
+        return scores
+
+    def similarity_search_by_vector_with_score(self, embedding: List[float], k: int = 4,
+                                               filter: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, float]]:
+        """Top k chunks by cosine similarity to an embedding"""
+        self._compact()
+        if not self._ids:
+            return []
+        scores = self._cosine_scores(np.asarray(embedding, dtype=np.float32))
+        if filter:
+            mask = np.array([matches_filter(metadata, filter) for metadata in self._metadatas])
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (Document(page_content=self._documents[i], metadata=self._metadatas[i]), float(scores[i]))
+            for i in top if np.isfinite(scores[i])
+        ]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None,
+                                     **kwargs: Any) -> List[Tuple[Document, float]]:
+        """Top k chunks by cosine similarity to a query"""
+        return self.similarity_search_by_vector_with_score(self.embedding_function.embed_query(query), k, filter)
+
+    def similarity_search_with_relevance_scores(self, query: str, k: int = 4,
+                                                **kwargs: Any) -> List[Tuple[Document, float]]:
+        """
+        Top k chunks with relevance scores on the same scale as the Chroma backend.
+
+        Chroma reports squared L2 distances, which langchain maps to 1 - d / sqrt(2);
+        for unit vectors d = 2 - 2 * cosine.
+        """
+        hits = self.similarity_search_with_score(query, k, kwargs.get("filter"))
+        return [(doc, 1.0 - (2.0 - 2.0 * score) / math.sqrt(2)) for doc, score in hits]
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None,
+                          **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding, metadatas: Optional[List[dict]] = None,
+                   persist_directory: str = "flat_index", quantize: bool = False,
+                   **kwargs: Any) -> "FlatVectorStore":
+        store = cls(persist_directory, embedding_function=embedding, quantize=quantize)
+        store.add_texts(texts, metadatas, kwargs.get("ids"))
+        store.persist()
+        return store
+
+    def __len__(self):
+        return len(self._rows)